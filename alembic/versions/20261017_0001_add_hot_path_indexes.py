@@ -0,0 +1,70 @@
+"""add hot path indexes
+
+Indexes for the email filters (sr_fct_header, fct_visits) and the
+keyid IN (...) lookups (items, attachments, both logs tables), plus the
+item timestamps the delta sync filters on. Tables are
+created outside of Alembic, so this revision only touches indexes and skips
+any that already exist under the same name or on the same columns
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 09:00:00
+"""
+
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ("ix_sr_fct_header_fspemail_keyid", "sr_fct_header", ["fspemail", "keyid"]),
+    ("ix_sr_fct_header_rsmemail_keyid", "sr_fct_header", ["rsmemail", "keyid"]),
+    ("ix_sr_fct_header_keyid", "sr_fct_header", ["keyid"]),
+    ("ix_sr_fct_header_created_at_id", "sr_fct_header", ["created_at", "id"]),
+    (
+        "ix_sr_fct_items_keyid_created_at_id",
+        "sr_fct_items",
+        ["keyid", "created_at", "id"],
+    ),
+    ("ix_sr_fct_items_updated_at", "sr_fct_items", ["updated_at"]),
+    ("ix_sr_fct_items_m_updated_at", "sr_fct_items", ["m_updated_at"]),
+    (
+        "ix_sr_fct_attachment_keyid_created_at_id",
+        "sr_fct_attachment",
+        ["keyid", "created_at", "id"],
+    ),
+    ("ix_sr_fct_logsremarksheader_keyid", "sr_fct_logsremarksheader", ["keyid"]),
+    ("ix_sr_fct_logsremarksitems_keyid", "sr_fct_logsremarksitems", ["keyid"]),
+    ("ix_fct_visits_fspemail", "fct_visits", ["fspemail"]),
+    ("ix_fct_visits_rsmemail", "fct_visits", ["rsmemail"]),
+]
+
+
+def _existing_indexes(table):
+    """Names and column lists of the indexes already on a table"""
+    if context.is_offline_mode():
+        return set(), []
+    inspector = sa.inspect(op.get_bind())
+    indexes = inspector.get_indexes(table)
+    return {index["name"] for index in indexes}, [
+        index["column_names"] for index in indexes
+    ]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        names, column_lists = _existing_indexes(table)
+        if name in names or columns in column_lists:
+            continue
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        names, _ = _existing_indexes(table)
+        if context.is_offline_mode() or name in names:
+            op.drop_index(name, table_name=table)
@@ -1,12 +1,14 @@
 # app/api/deps.py
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError, DatabaseError, OperationalError
-from typing import Generator
+from typing import Any, AsyncGenerator, Callable, Generator, Union
 from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
 import logging
 import uuid
 
-from app.db.database import get_db
+from app.db.database import get_db, get_async_db
 from app.core.config import get_settings
 from app.core.exceptions import DatabaseException, BaseCustomException
 
@@ -79,6 +81,84 @@ def get_db_session() -> Generator[Session, None, None]:
                 logger.warning(f"Error closing database session: {str(e)}")
 
 
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async database session dependency, mirrors get_db_session error handling
+    Used when DB_ASYNC=true so queries do not block the event loop
+    """
+    db = None
+    db_gen = get_async_db()
+    try:
+        logger.debug("Creating async database session")
+        db = await db_gen.__anext__()
+        yield db
+        logger.debug("Async database session completed successfully")
+
+    except BaseCustomException:
+        if db:
+            try:
+                await db.rollback()
+            except Exception:
+                pass
+        raise
+
+    except (DatabaseError, OperationalError) as e:
+        logger.error(f"Database connection error: {str(e)}", exc_info=True)
+        if db:
+            try:
+                await db.rollback()
+            except Exception:
+                pass
+        raise DatabaseException("Database connection failed", details=str(e))
+
+    except SQLAlchemyError as e:
+        logger.error(f"SQLAlchemy error: {str(e)}", exc_info=True)
+        if db:
+            try:
+                await db.rollback()
+            except Exception:
+                pass
+        raise DatabaseException("Database query failed", details=str(e))
+
+    except Exception as e:
+        logger.error(
+            f"Unexpected database session error: {type(e).__name__}: {str(e)}",
+            exc_info=True,
+        )
+        if db:
+            try:
+                await db.rollback()
+            except Exception:
+                pass
+        raise DatabaseException(
+            "Unexpected database error", details=f"{type(e).__name__}: {str(e)}"
+        )
+
+    finally:
+        try:
+            logger.debug("Closing async database session")
+            await db_gen.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing async database session: {str(e)}")
+
+
+# Session type handed to the routes, selected by DB_ASYNC
+DBSession = Union[Session, AsyncSession]
+get_session = get_async_db_session if settings.DB_ASYNC else get_db_session
+
+
+async def call_crud(
+    sync_method: Callable[..., Any], async_method: Callable[..., Any], **kwargs
+) -> Any:
+    """
+    Run a CRUD call on the configured session type without blocking the loop
+    Sync CRUD runs in the threadpool, async CRUD is awaited directly
+    """
+    if settings.DB_ASYNC:
+        return await async_method(**kwargs)
+    return await run_in_threadpool(sync_method, **kwargs)
+
+
 def get_request_id(request: Request) -> str:
     """Get request ID from request state with fallback"""
     request_id = getattr(request.state, "request_id", None)
@@ -1,38 +1,75 @@
 # app/api/v1/sr_items.py
-from fastapi import APIRouter, Depends, Query, Request
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Query, Request, Response
+from typing import List, Optional
 import logging
 
-from app.api.deps import get_db_session
-from app.crud.sr_items import sr_items_crud
+from app.api.deps import DBSession, get_session, call_crud
+from app.core.config import get_settings
+from app.core.etag import make_etag, etag_matches, not_modified
+from app.core.pagination import decode_cursor
+from app.crud.sr_items import sr_items_crud, async_sr_items_crud
+from app.crud.sr_freshness import sr_freshness_crud, async_sr_freshness_crud
 from app.schemas.sr_fct_items import SrFctItemsResponse
-from app.schemas.base import SuccessResponse
+from app.schemas.base import PaginatedResponse
 from app.core.exceptions import InvalidEmailException, SRItemsNotFoundException
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 router = APIRouter()
 
 
-@router.get("/", response_model=SuccessResponse[List[SrFctItemsResponse]])
+@router.get("/", response_model=PaginatedResponse[List[SrFctItemsResponse]])
 async def get_sr_items_by_email(
     request: Request,
+    response: Response,
     email: str = Query(..., description="Filter by email"),
-    db: Session = Depends(get_db_session),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor from the previous page, omit for the first page"
+    ),
+    limit: int = Query(
+        settings.PAGE_SIZE_DEFAULT,
+        ge=1,
+        le=settings.PAGE_SIZE_MAX,
+        description="Page size",
+    ),
+    db: DBSession = Depends(get_session),
 ):
-    """Get all sales return items by email"""
+    """Get a page of sales return items by email"""
     # Validate email format
     if not email or "@" not in email:
         raise InvalidEmailException(email)
+    after = decode_cursor(cursor) if cursor else None
+
+    # Answer conditional requests from the freshness probe alone
+    freshness = await call_crud(
+        sr_freshness_crud.get_by_email,
+        async_sr_freshness_crud.get_by_email,
+        db=db,
+        email=email,
+    )
+    etag = make_etag(
+        "sr_items", email, freshness["headers"], freshness["items"], cursor, limit
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
     # Get data from database
-    items = sr_items_crud.get_by_email(db=db, email=email)
+    items, next_cursor = await call_crud(
+        sr_items_crud.get_page_by_email,
+        async_sr_items_crud.get_page_by_email,
+        db=db,
+        email=email,
+        cursor=after,
+        limit=limit,
+    )
 
-    # Check if data exists
-    if not items:
+    # Check if data exists (an empty later page just means the list is exhausted)
+    if not items and after is None:
         raise SRItemsNotFoundException(f"email: {email}")
 
-    return SuccessResponse(
+    response.headers["ETag"] = etag
+    return PaginatedResponse(
         data=items,
         message="Successfully retrieved Sales Return items",
+        next_cursor=next_cursor,
     )
@@ -1,11 +1,13 @@
 # app/api/v1/sr_logsremarksheader.py
 from fastapi import APIRouter, Depends, Query, Request
-from sqlalchemy.orm import Session
 from typing import List
 import logging
 
-from app.api.deps import get_db_session
-from app.crud.sr_logsremarksheader import sr_logsremarksheader_crud
+from app.api.deps import DBSession, get_session, call_crud
+from app.crud.sr_logsremarksheader import (
+    sr_logsremarksheader_crud,
+    async_sr_logsremarksheader_crud,
+)
 from app.schemas.sr_fct_logsremarksheader import SrFctLogsRemarksHeaderResponse
 from app.schemas.base import SuccessResponse
 from app.core.exceptions import InvalidEmailException, SRNotFoundException
@@ -18,7 +20,7 @@ router = APIRouter()
 async def get_sr_header_logs_by_email(
     request: Request,
     email: str = Query(..., description="Filter by email"),
-    db: Session = Depends(get_db_session),
+    db: DBSession = Depends(get_session),
 ):
     """Get all sales return header logs by email"""
     # Validate email format
@@ -26,7 +28,12 @@ async def get_sr_header_logs_by_email(
         raise InvalidEmailException(email)
 
     # Get data from database
-    header_logs = sr_logsremarksheader_crud.get_by_email(db=db, email=email)
+    header_logs = await call_crud(
+        sr_logsremarksheader_crud.get_by_email,
+        async_sr_logsremarksheader_crud.get_by_email,
+        db=db,
+        email=email,
+    )
 
     # Check if data exists
     if not header_logs:
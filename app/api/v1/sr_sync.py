@@ -1,47 +1,330 @@
 # app/api/v1/sr_sync.py
 from fastapi import APIRouter, Depends, Query, Request
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterator, Literal, Optional
 import logging
 
-from app.api.deps import get_db_session
-from app.crud.sr_sync import sr_sync_crud
-from app.schemas.sr_sync import SrSyncResponse
+from app.api.deps import DBSession, get_session, call_crud
+from app.core.config import get_settings
+from app.core.cache import sync_response_cache
+from app.core.etag import make_etag, etag_matches, not_modified
+from app.core.metrics import sync_payload_bytes
+from app.core.responses import (
+    dump_json,
+    success_envelope_prefix,
+    success_json_response,
+)
+from app.db import database
+from app.crud.sr_sync import sr_sync_crud, async_sr_sync_crud
+from app.crud.sr_freshness import sr_freshness_crud, async_sr_freshness_crud
+from app.schemas.sr_sync import (
+    UserData,
+    SrSyncResponse,
+    SrSyncBatchRequest,
+    SrSyncBatchResponse,
+    SrSyncReconcileRequest,
+    SrSyncReconcileResponse,
+)
 from app.core.exceptions import (
     InvalidEmailException,
     SRNotFoundException,
+    ValidationException,
 )
 from app.schemas.base import SuccessResponse
+from app.services.dimension_cache import dimension_cache
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 router = APIRouter()
 
+SYNC_SUCCESS_MESSAGE = "Successfully retrieved all Sales Return data"
+
+ENRICH_DESCRIPTION = (
+    "Add dropdown labels and material descriptions from the dimension cache"
+)
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/json",
+}
+
+
+class SyncStreamEncoder:
+    """
+    Turns the (kind, value) events of iter_sr_data_by_email into response bytes
+    ndjson: one {"type": ..., "data": ...} record per line, ending with an "end" record
+    json: the same SuccessResponse[SrSyncResponse] document as GET /sr/sync
+    """
+
+    def __init__(self, fmt: str, user: UserData):
+        self.fmt = fmt
+        self.user = user
+        self.header_count = 0
+        self.attachment_count = 0
+        self.bytes_sent = 0
+
+    def start(self) -> bytes:
+        if self.fmt == "ndjson":
+            chunk = (
+                b'{"type":"user","data":'
+                + self.user.model_dump_json().encode()
+                + b"}\n"
+            )
+        else:
+            chunk = (
+                success_envelope_prefix(SYNC_SUCCESS_MESSAGE)
+                + b'{"user":'
+                + self.user.model_dump_json().encode()
+                + b',"header":['
+            )
+        self.bytes_sent += len(chunk)
+        return chunk
+
+    def encode(self, kind: str, value: Any) -> bytes:
+        chunk = self._encode(kind, value)
+        self.bytes_sent += len(chunk)
+        return chunk
+
+    def _encode(self, kind: str, value: Any) -> bytes:
+        data = dump_json(value)
+        if kind == "header":
+            self.header_count += 1
+        elif kind == "attachment":
+            self.attachment_count += 1
+
+        if self.fmt == "ndjson":
+            if kind == "watermark":
+                return b'{"type":"end","watermark":' + data + b"}\n"
+            return b'{"type":"' + kind.encode() + b'","data":' + data + b"}\n"
+
+        if kind == "header":
+            return (b"," if self.header_count > 1 else b"") + data
+        if kind == "attachment":
+            if self.attachment_count == 1:
+                return b'],"attachments":[' + data
+            return b"," + data
+        closing = b"]" if self.attachment_count else b'],"attachments":[]'
+        return closing + b',"deleted_attachments":[],"watermark":' + data + b"}}"
+
+
+def _stream_sr_data(
+    email: str, encoder: SyncStreamEncoder, enrich: bool
+) -> Iterator[bytes]:
+    # Own session: the request-scoped one is closed before the body is sent
+    db = database.SessionLocal()
+    try:
+        yield encoder.start()
+        for kind, value in sr_sync_crud.iter_sr_data_by_email(
+            db, email=email, chunk_size=settings.SYNC_STREAM_CHUNK_SIZE
+        ):
+            if enrich and kind == "header":
+                sr_sync_crud.enrich_header(value)
+            yield encoder.encode(kind, value)
+    finally:
+        db.close()
+        sync_payload_bytes.observe(encoder.bytes_sent, ("stream",))
+
+
+async def _async_stream_sr_data(
+    email: str, encoder: SyncStreamEncoder, enrich: bool
+) -> AsyncIterator[bytes]:
+    try:
+        async with database.AsyncSessionLocal() as db:
+            yield encoder.start()
+            async for kind, value in async_sr_sync_crud.iter_sr_data_by_email(
+                db, email=email, chunk_size=settings.SYNC_STREAM_CHUNK_SIZE
+            ):
+                if enrich and kind == "header":
+                    async_sr_sync_crud.enrich_header(value)
+                yield encoder.encode(kind, value)
+    finally:
+        sync_payload_bytes.observe(encoder.bytes_sent, ("stream",))
+
 
 @router.get("/", response_model=SuccessResponse[SrSyncResponse])
 async def get_sr_data_by_email(
     request: Request,
     email: str = Query(..., description="Filter by fspemail or rsmemail"),
-    db: Session = Depends(get_db_session),
+    updated_since: Optional[datetime] = Query(
+        None,
+        description=(
+            "Watermark from the previous sync, returns changes at or after it "
+            "(inclusive, de-duplicate by appkey)"
+        ),
+    ),
+    enrich: bool = Query(False, description=ENRICH_DESCRIPTION),
+    db: DBSession = Depends(get_session),
 ):
     """Get all sales return data by email in the required JSON format (ssaemail support removed for now)"""
     # Validate email
     if not email or "@" not in email:
         raise InvalidEmailException(email)
 
+    # Answer conditional requests from the freshness probe alone
+    freshness = await call_crud(
+        sr_freshness_crud.get_by_email,
+        async_sr_freshness_crud.get_by_email,
+        db=db,
+        email=email,
+    )
+    # Enriched payloads also depend on the dimension cache version
+    etag = make_etag(
+        "sr_sync",
+        email,
+        updated_since,
+        freshness,
+        dimension_cache.version if enrich else None,
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    # Full syncs are cached per email while the freshness tag is unchanged
+    use_cache = sync_response_cache is not None and updated_since is None
+    cache_key = f"sr_sync:{email}:enriched" if enrich else f"sr_sync:{email}"
+    if use_cache:
+        cached = await sync_response_cache.get(cache_key, etag)
+        if cached is not None:
+            sync_payload_bytes.observe(len(cached), ("full",))
+            return success_json_response(
+                cached, SYNC_SUCCESS_MESSAGE, headers={"ETag": etag}
+            )
+
     # Get data from database
-    sr_data = sr_sync_crud.get_sr_data_by_email(db=db, email=email)
+    if updated_since is not None:
+        sr_data = await call_crud(
+            sr_sync_crud.get_sr_delta_by_email,
+            async_sr_sync_crud.get_sr_delta_by_email,
+            db=db,
+            email=email,
+            updated_since=updated_since,
+        )
+    else:
+        sr_data = await call_crud(
+            sr_sync_crud.get_sr_data_by_email,
+            async_sr_sync_crud.get_sr_data_by_email,
+            db=db,
+            email=email,
+        )
+
+    # Check if any data was found (an empty delta just means nothing changed)
+    if updated_since is None and not sr_data["header"] and not sr_data["attachments"]:
+        raise SRNotFoundException("data", f"email: {email}")
+
+    if enrich:
+        sr_sync_crud.enrich_sr_data(sr_data)
+
+    # Encode the trusted payload once; response_model only documents the shape
+    data_json = dump_json(sr_data)
+    sync_payload_bytes.observe(
+        len(data_json), ("delta" if updated_since is not None else "full",)
+    )
+
+    if use_cache:
+        await sync_response_cache.set(cache_key, etag, data_json)
 
-    # Check if any data was found
-    if not sr_data["header"] and not sr_data["attachments"]:
+    return success_json_response(
+        data_json, SYNC_SUCCESS_MESSAGE, headers={"ETag": etag}
+    )
+
+
+@router.get("/stream")
+async def stream_sr_data_by_email(
+    request: Request,
+    email: str = Query(..., description="Filter by fspemail or rsmemail"),
+    format: Literal["ndjson", "json"] = Query(
+        "ndjson", description="ndjson records or a single streamed JSON document"
+    ),
+    enrich: bool = Query(False, description=ENRICH_DESCRIPTION),
+    db: DBSession = Depends(get_session),
+):
+    """Stream the full sync in chunks instead of building the whole payload in memory"""
+    if not email or "@" not in email:
+        raise InvalidEmailException(email)
+
+    user = await call_crud(
+        sr_sync_crud.get_user_by_email,
+        async_sr_sync_crud.get_user_by_email,
+        db=db,
+        email=email,
+    )
+    if user is None:
         raise SRNotFoundException("data", f"email: {email}")
 
-    # Create the response
-    sync_response = SrSyncResponse(
-        user=sr_data["user"],
-        header=sr_data["header"],
-        attachments=sr_data["attachments"],
+    encoder = SyncStreamEncoder(format, user)
+    if settings.DB_ASYNC:
+        body = _async_stream_sr_data(email, encoder, enrich)
+    else:
+        body = _stream_sr_data(email, encoder, enrich)
+    return StreamingResponse(body, media_type=STREAM_MEDIA_TYPES[format])
+
+
+@router.post("/batch", response_model=SuccessResponse[SrSyncBatchResponse])
+async def get_sr_data_by_emails(
+    request: Request,
+    payload: SrSyncBatchRequest,
+    db: DBSession = Depends(get_session),
+):
+    """Full sync for many emails at once with a fixed number of queries"""
+    emails = list(dict.fromkeys(payload.emails))
+    if len(emails) > settings.SYNC_BATCH_MAX_EMAILS:
+        raise ValidationException(
+            f"At most {settings.SYNC_BATCH_MAX_EMAILS} emails per batch",
+            "emails",
+        )
+    for email in emails:
+        if not email or "@" not in email:
+            raise InvalidEmailException(email)
+
+    batch_data = await call_crud(
+        sr_sync_crud.get_sr_data_by_emails,
+        async_sr_sync_crud.get_sr_data_by_emails,
+        db=db,
+        emails=emails,
     )
 
-    return SuccessResponse(
-        data=sync_response,
-        message="Successfully retrieved all Sales Return data",
+    results = {}
+    not_found = []
+    for email, sr_data in batch_data.items():
+        if not sr_data["header"] and not sr_data["attachments"]:
+            not_found.append(email)
+            continue
+        if payload.enrich:
+            sr_sync_crud.enrich_sr_data(sr_data)
+        results[email] = sr_data
+
+    if not results:
+        raise SRNotFoundException("data", f"emails: {', '.join(emails)}")
+
+    data_json = dump_json({"results": results, "not_found": not_found})
+    sync_payload_bytes.observe(len(data_json), ("batch",))
+    return success_json_response(
+        data_json, "Successfully retrieved Sales Return data for all emails"
+    )
+
+
+@router.post("/reconcile", response_model=SuccessResponse[SrSyncReconcileResponse])
+async def reconcile_sr_data_by_email(
+    request: Request,
+    payload: SrSyncReconcileRequest,
+    db: DBSession = Depends(get_session),
+):
+    """Return only headers whose content hash differs from the client's, plus deletions"""
+    email = payload.email
+    if not email or "@" not in email:
+        raise InvalidEmailException(email)
+
+    sr_data = await call_crud(
+        sr_sync_crud.reconcile_by_email,
+        async_sr_sync_crud.reconcile_by_email,
+        db=db,
+        email=email,
+        client_hashes=payload.headers,
     )
+
+    if not sr_data["header"] and not sr_data["hashes"] and not payload.headers:
+        raise SRNotFoundException("data", f"email: {email}")
+
+    data_json = dump_json(sr_data)
+    sync_payload_bytes.observe(len(data_json), ("reconcile",))
+    return success_json_response(data_json, "Successfully reconciled Sales Return data")
@@ -0,0 +1,267 @@
+# app/core/cache.py
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+from app.core.metrics import registry, cache_requests_total
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class CacheBackend(ABC):
+    """Storage for (tag, value) pairs with a TTL and a total size cap"""
+
+    # Backends doing I/O are called from the threadpool
+    blocking = False
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]: ...
+
+    @abstractmethod
+    def set(self, key: str, tag: str, value: bytes, ttl: int) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]: ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU with TTL and a byte cap"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[str, bytes, float]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            tag, value, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return tag, value
+
+    def set(self, key: str, tag: str, value: bytes, ttl: int) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (tag, value, time.monotonic() + ttl)
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size}
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    File-backed store shared by every worker process on the host
+    Local stand-in for a networked cache such as Redis
+    """
+
+    blocking = True
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, tag TEXT NOT NULL, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_response_cache_accessed_at "
+                "ON response_cache (accessed_at)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT tag, value FROM response_cache WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE response_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            return row[0], bytes(row[1])
+
+    def set(self, key: str, tag: str, value: bytes, ttl: int) -> None:
+        if len(value) > self.max_bytes:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache "
+                "(key, tag, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, tag, value, len(value), now + ttl, now),
+            )
+            conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,))
+            total = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM response_cache"
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                # Evict least recently used entries until under the cap
+                rows = conn.execute(
+                    "SELECT key, size FROM response_cache ORDER BY accessed_at"
+                ).fetchall()
+                evict = []
+                for evict_key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    evict.append((evict_key,))
+                    total -= size
+                conn.executemany("DELETE FROM response_cache WHERE key = ?", evict)
+
+    def delete(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM response_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM response_cache"
+            ).fetchone()
+        return {"entries": entries, "bytes": size}
+
+
+class ResponseCache:
+    """
+    Serialized response cache keyed by a name plus a freshness tag
+    A stored value is only served while its tag matches the caller's current
+    tag (e.g. the ETag from the freshness probe), so DB changes invalidate it
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def _call(self, method, *args):
+        if self.backend.blocking:
+            return await run_in_threadpool(method, *args)
+        return method(*args)
+
+    async def get(self, key: str, tag: str) -> Optional[bytes]:
+        try:
+            entry = await self._call(self.backend.get, key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {e}")
+            entry = None
+        if entry is None or entry[0] != tag:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    async def set(self, key: str, tag: str, value: bytes) -> None:
+        try:
+            await self._call(self.backend.set, key, tag, value, self.ttl)
+        except Exception as e:
+            logger.warning(f"Response cache write failed: {e}")
+
+    async def invalidate(self, key: str) -> None:
+        await self._call(self.backend.delete, key)
+
+    async def clear(self) -> None:
+        await self._call(self.backend.clear)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            **self.backend.stats(),
+        }
+
+
+def build_response_cache() -> Optional[ResponseCache]:
+    """Response cache for the configured SYNC_CACHE_BACKEND, None if disabled"""
+    backend_name = settings.SYNC_CACHE_BACKEND.lower()
+    if backend_name == "memory":
+        backend = MemoryCacheBackend(settings.SYNC_CACHE_MAX_BYTES)
+    elif backend_name == "sqlite":
+        backend = SQLiteCacheBackend(
+            settings.SYNC_CACHE_PATH, settings.SYNC_CACHE_MAX_BYTES
+        )
+    elif backend_name == "none":
+        return None
+    else:
+        raise ValueError(f"Unknown SYNC_CACHE_BACKEND: {settings.SYNC_CACHE_BACKEND}")
+    return ResponseCache(backend, settings.SYNC_CACHE_TTL_SECONDS)
+
+
+sync_response_cache = build_response_cache()
+
+
+def collect_cache_metrics():
+    if sync_response_cache is not None:
+        cache_requests_total.set_total(
+            sync_response_cache.hits, ("sync_response", "hit")
+        )
+        cache_requests_total.set_total(
+            sync_response_cache.misses, ("sync_response", "miss")
+        )
+
+
+registry.add_collector(collect_cache_metrics)
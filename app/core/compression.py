@@ -0,0 +1,214 @@
+# app/core/compression.py
+import logging
+import zlib
+from typing import List, Optional, Union
+
+from anyio import to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+class GzipEncoder:
+    """Incremental gzip stream (zlib with a gzip header)"""
+
+    name = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        # Sync flush so every streamed chunk is decodable on arrival
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class BrotliEncoder:
+    """Incremental brotli stream, only available when the brotli package is installed"""
+
+    name = "br"
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+def _accepted_encodings(accept_encoding: str) -> List[str]:
+    """Codings from Accept-Encoding with a non-zero q value"""
+    accepted = []
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding and quality > 0:
+            accepted.append(coding.strip().lower())
+    return accepted
+
+
+def negotiate_encoder(
+    accept_encoding: str,
+) -> Optional[Union[GzipEncoder, BrotliEncoder]]:
+    """Brotli when installed and accepted, then gzip, else None"""
+    accepted = _accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return BrotliEncoder(settings.COMPRESSION_BROTLI_QUALITY)
+    if "gzip" in accepted or "*" in accepted:
+        return GzipEncoder(settings.COMPRESSION_GZIP_LEVEL)
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Negotiated gzip/brotli compression as pure ASGI
+    Single-body responses under COMPRESSION_MIN_SIZE pass through untouched;
+    streamed responses are compressed chunk by chunk. Chunks of
+    COMPRESSION_THREAD_MIN_SIZE or more are compressed in a worker thread
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoder = negotiate_encoder(Headers(scope=scope).get("accept-encoding", ""))
+        if encoder is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(scope, send, encoder)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Per-request send wrapper holding the start message until the body is seen"""
+
+    def __init__(self, scope: Scope, send: Send, encoder):
+        self.scope = scope
+        self._send = send
+        self.encoder = encoder
+        self.start_message: Optional[Message] = None
+        self.active: Optional[bool] = None  # None until the first body message
+        self.raw_size = 0
+        self.compressed_size = 0
+
+    def _should_compress(self, headers: Headers, status: int) -> bool:
+        if status < 200 or status in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def _run(self, fn, data: bytes) -> bytes:
+        if len(data) >= settings.COMPRESSION_THREAD_MIN_SIZE:
+            return await to_thread.run_sync(fn, data)
+        return fn(data)
+
+    def _compressed_headers(self, streaming: bool) -> MutableHeaders:
+        headers = MutableHeaders(scope=self.start_message)
+        headers["Content-Encoding"] = self.encoder.name
+        headers.add_vary_header("Accept-Encoding")
+        # The compressed bytes are a different representation of the same entity
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        if streaming:
+            del headers["Content-Length"]
+        return headers
+
+    async def send(self, message: Message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            return
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.active is None:
+            self.active = self._should_compress(
+                Headers(raw=self.start_message["headers"]),
+                self.start_message["status"],
+            )
+            if self.active and not more_body:
+                self.active = len(body) >= settings.COMPRESSION_MIN_SIZE
+
+            if not self.active:
+                await self._send(self.start_message)
+                await self._send(message)
+                return
+
+            if not more_body:
+                compressed = await self._run(self.encoder.finish, body)
+                headers = self._compressed_headers(streaming=False)
+                headers["Content-Length"] = str(len(compressed))
+                await self._send(self.start_message)
+                await self._send({"type": "http.response.body", "body": compressed})
+                self._log(len(body), len(compressed), streaming=False)
+                return
+
+            self._compressed_headers(streaming=True)
+            await self._send(self.start_message)
+        elif not self.active:
+            await self._send(message)
+            return
+
+        # Streaming: compress each chunk as it arrives
+        self.raw_size += len(body)
+        if more_body:
+            chunk = await self._run(self.encoder.compress, body) if body else b""
+        else:
+            chunk = await self._run(self.encoder.finish, body)
+        self.compressed_size += len(chunk)
+        await self._send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
+        if not more_body:
+            self._log(self.raw_size, self.compressed_size, streaming=True)
+
+    def _log(self, raw_size: int, compressed_size: int, streaming: bool):
+        state = self.scope.get("state", {})
+        logger.info(
+            f"Compressed response ({self.encoder.name}): "
+            f"{raw_size} -> {compressed_size} bytes",
+            extra={
+                "request_id": state.get("request_id", "unknown"),
+                "path": self.scope["path"],
+                "encoding": self.encoder.name,
+                "uncompressed_size": raw_size,
+                "compressed_size": compressed_size,
+                "ratio": round(compressed_size / raw_size, 3) if raw_size else None,
+                "streaming": streaming,
+            },
+        )
@@ -20,6 +20,52 @@ class Settings(BaseSettings):
     DB_PASSWORD: str
     DB_HOST: str
     DB_PORT: int = 3306
+    DB_ASYNC: bool = False  # Use AsyncEngine/AsyncSession for the API routes
+    DB_POOL_WARMUP_CONNECTIONS: int = 0  # Opened and validated at startup
+    ASYNC_DATABASE_URL: Optional[str] = None  # Derived from DATABASE_URL if unset
+    EXPLAIN_CHECK_ON_STARTUP: bool = False  # Warn about hot queries doing full scans
+    SERVER_TIMING_ENABLED: bool = True  # Server-Timing header with per-request DB time
+    LAZY_LOAD_POLICY: str = "off"  # "warn" or "raise" on relationship lazy loads
+    SQLITE_JOURNAL_MODE: str = "WAL"  # SQLite only, readers do not block the writer
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # SQLite only, safe with WAL, fewer fsyncs
+    SQLITE_BUSY_TIMEOUT: int = 30  # SQLite only, seconds to wait on a locked database
+    STARTUP_CHECK_MAX_BACKOFF_SECONDS: int = 60  # Cap between verification retries
+    READY_DB_TIMEOUT_SECONDS: int = 5  # Database ping in /ready
+
+    # Responses
+    JSON_ENCODER: str = "auto"  # "auto" (orjson when installed), "orjson" or "json"
+
+    # Dimension cache (DimCustomDropdown, DimMara, DimCustomer)
+    DIMENSION_CACHE_ENABLED: bool = True
+    DIMENSION_CACHE_REFRESH_SECONDS: int = 60  # Change probe interval
+    DIMENSION_CACHE_FULL_RELOAD_SECONDS: int = 3600  # Reload even without a change
+
+    # Compression (gzip, or brotli when the brotli package is installed)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # Smaller single-body responses are sent as is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_THREAD_MIN_SIZE: int = 256 * 1024  # Larger chunks compress off-loop
+
+    # Metrics (/metrics, Prometheus text format)
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: Optional[str] = None  # Shared by workers, wipe on deploy
+    METRICS_FLUSH_SECONDS: int = 5  # How often each worker writes its snapshot
+
+    # Pagination (email-scoped list endpoints)
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 1000
+
+    # SR sync
+    SYNC_HASH_CACHE_SIZE: int = 50000  # Cached header content hashes (reconcile)
+    SYNC_CACHE_BACKEND: str = (
+        "memory"  # "memory", "sqlite" (shared by workers) or "none"
+    )
+    SYNC_CACHE_TTL_SECONDS: int = 300
+    SYNC_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    SYNC_CACHE_PATH: str = "cache/sync_cache.sqlite3"  # sqlite backend only
+    SYNC_STREAM_CHUNK_SIZE: int = 500  # Headers/attachments per query when streaming
+    SYNC_BATCH_MAX_EMAILS: int = 50  # Cap for POST /sr/sync/batch
 
     # Security
     SECRET_KEY: str
@@ -63,6 +109,20 @@ class Settings(BaseSettings):
     def show_docs(self) -> bool:
         return not self.is_production()
 
+    @property
+    def async_database_url(self) -> str:
+        """Async driver URL, e.g. mysql+pymysql:// -> mysql+aiomysql://"""
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+        for sync_prefix, async_prefix in (
+            ("mysql+pymysql://", "mysql+aiomysql://"),
+            ("sqlite+pysqlite://", "sqlite+aiosqlite://"),
+            ("sqlite://", "sqlite+aiosqlite://"),
+        ):
+            if self.DATABASE_URL.startswith(sync_prefix):
+                return async_prefix + self.DATABASE_URL[len(sync_prefix) :]
+        return self.DATABASE_URL
+
     # ---------- PROPER CONFIGURATION ----------
 
     @property
@@ -0,0 +1,36 @@
+# app/core/etag.py
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from the repr of cheap freshness values (counts, timestamps, params)"""
+    raw = "|".join(repr(part) for part in (settings.APP_VERSION, *parts))
+    return f'"{hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already lists this ETag"""
+    if_none_match: Optional[str] = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response for a matching If-None-Match"""
+    return Response(status_code=304, headers={"ETag": etag})
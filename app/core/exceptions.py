@@ -10,6 +10,7 @@ import traceback
 import uuid
 
 from app.core.config import get_settings
+from app.core.responses import AppJSONResponse
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -101,6 +102,13 @@ class InvalidKeyIdException(ValidationException):
         super().__init__(message, "keyid")
 
 
+class InvalidCursorException(ValidationException):
+    """When a pagination cursor cannot be decoded"""
+
+    def __init__(self, cursor: Optional[str] = None):
+        super().__init__(f"Invalid cursor: {cursor}", "cursor")
+
+
 # 401 - Unauthorized
 class UnauthorizedException(BaseCustomException):
     """For authentication errors"""
@@ -276,7 +284,7 @@ async def base_custom_exception_handler(
         include_stack_trace=exc.status_code >= 500,
     )
 
-    return JSONResponse(
+    return AppJSONResponse(
         status_code=exc.status_code,
         content=error_response.model_dump(mode="json", exclude_none=True),
     )
@@ -329,7 +337,7 @@ async def validation_exception_handler(
         },
     )
 
-    return JSONResponse(
+    return AppJSONResponse(
         status_code=422,
         content=error_response.model_dump(mode="json", exclude_none=True),
     )
@@ -378,7 +386,7 @@ async def http_exception_handler_custom(
         },
     )
 
-    return JSONResponse(
+    return AppJSONResponse(
         status_code=exc.status_code,
         content=error_response.model_dump(mode="json", exclude_none=True),
     )
@@ -419,7 +427,7 @@ async def generic_exception_handler(request: Request, exc: Exception) -> JSONRes
         exception=exc,
     )
 
-    return JSONResponse(
+    return AppJSONResponse(
         status_code=500,
         content=error_response.model_dump(mode="json", exclude_none=True),
     )
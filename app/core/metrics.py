@@ -0,0 +1,345 @@
+# app/core/metrics.py
+import asyncio
+import bisect
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1024, 10_240, 102_400, 1_048_576, 10_485_760, 104_857_600)
+
+Labels = Tuple[str, ...]
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, Any] = {}
+        self._lock = threading.Lock()
+
+    def samples(self) -> List[Tuple[Labels, Any]]:
+        with self._lock:
+            return [
+                (labels, self._copy(value)) for labels, value in self._values.items()
+            ]
+
+    def _copy(self, value):
+        return value
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def set_total(self, value: float, labels: Labels = ()) -> None:
+        """For collectors mirroring a running total kept elsewhere"""
+        with self._lock:
+            self._values[labels] = value
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, labels: Labels = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+
+class Histogram(_Metric):
+    """Per label set: [count per bucket (last one is +Inf), sum]"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float],
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def _copy(self, value):
+        return [list(value[0]), value[1]]
+
+
+class MetricsRegistry:
+    """
+    Low-overhead in-process metrics with Prometheus text exposition
+
+    Every worker process keeps its own values. With METRICS_MULTIPROC_DIR set,
+    each worker also writes a snapshot there every METRICS_FLUSH_SECONDS and on
+    shutdown, and /metrics merges them: counters and histograms are summed
+    over all snapshots, gauges over the workers that are still running
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames=(), buckets=LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Called before every snapshot to refresh values read from other objects"""
+        self._collectors.append(collector)
+
+    # Snapshots
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.warning(f"Metrics collector failed: {e}")
+        return {
+            name: {
+                "type": metric.type,
+                "help": metric.documentation,
+                "labelnames": list(metric.labelnames),
+                "buckets": list(getattr(metric, "buckets", ())),
+                "samples": [
+                    [list(labels), value] for labels, value in metric.samples()
+                ],
+            }
+            for name, metric in self._metrics.items()
+        }
+
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(settings.METRICS_MULTIPROC_DIR, f"metrics_{pid}.json")
+
+    def write_snapshot(self) -> None:
+        """Publish this worker's values for the other workers' /metrics"""
+        os.makedirs(settings.METRICS_MULTIPROC_DIR, exist_ok=True)
+        path = self._snapshot_path(os.getpid())
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf8") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def _worker_snapshots(self) -> Iterable[Tuple[bool, Dict]]:
+        """(is running, snapshot) for every worker; this one is read live"""
+        yield True, self.snapshot()
+        own_pid = os.getpid()
+        directory = settings.METRICS_MULTIPROC_DIR
+        if not directory or not os.path.isdir(directory):
+            return
+        for file_name in os.listdir(directory):
+            if not (file_name.startswith("metrics_") and file_name.endswith(".json")):
+                continue
+            try:
+                pid = int(file_name[len("metrics_") : -len(".json")])
+            except ValueError:
+                continue
+            if pid == own_pid:
+                continue
+            try:
+                with open(os.path.join(directory, file_name), encoding="utf8") as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping metrics snapshot {file_name}: {e}")
+                continue
+            yield _pid_running(pid), snapshot
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """Values merged across worker processes"""
+        merged: Dict[str, Dict[str, Any]] = {}
+        for running, snapshot in self._worker_snapshots():
+            for name, family in snapshot.items():
+                if family["type"] == "gauge" and not running:
+                    continue
+                target = merged.setdefault(name, {**family, "values": {}})
+                values = target["values"]
+                for labels, value in family["samples"]:
+                    key = tuple(labels)
+                    if family["type"] == "histogram":
+                        current = values.get(key)
+                        if current is None:
+                            values[key] = [list(value[0]), value[1]]
+                        else:
+                            current[0] = [a + b for a, b in zip(current[0], value[0])]
+                            current[1] += value[1]
+                    else:
+                        values[key] = values.get(key, 0) + value
+        return merged
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for name, family in self.collect().items():
+            lines.append(f"# HELP {name} {family['help']}")
+            lines.append(f"# TYPE {name} {family['type']}")
+            labelnames = family["labelnames"]
+            for labels, value in sorted(family["values"].items()):
+                if family["type"] != "histogram":
+                    lines.append(f"{name}{_labels(labelnames, labels)} {str(value)}")
+                    continue
+                bucket_counts, total = value
+                cumulative = 0
+                bounds = [str(bound) for bound in family["buckets"]] + ["+Inf"]
+                for bound, count in zip(bounds, bucket_counts):
+                    cumulative += count
+                    bucket_labels = _labels(labelnames + ["le"], labels + (bound,))
+                    lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labelnames, labels)} {str(total)}")
+                lines.append(f"{name}_count{_labels(labelnames, labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    # Multi-process flushing
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(settings.METRICS_FLUSH_SECONDS)
+            try:
+                await run_in_threadpool(self.write_snapshot)
+            except Exception as e:
+                logger.error(f"Metrics snapshot write failed: {e}")
+
+    async def start(self):
+        if settings.METRICS_MULTIPROC_DIR:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if settings.METRICS_MULTIPROC_DIR:
+            try:
+                await run_in_threadpool(self.write_snapshot)
+            except Exception as e:
+                logger.error(f"Metrics snapshot write failed: {e}")
+
+
+def _pid_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+registry = MetricsRegistry()
+
+# HTTP
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds",
+    "Request latency by method, route template and status",
+    ("method", "route", "status"),
+)
+http_requests_in_progress = registry.gauge(
+    "http_requests_in_progress", "Requests currently being served"
+)
+
+# Database pool (values refreshed by the collector in app/db/database.py)
+db_pool_size = registry.gauge("db_pool_size", "Configured pool size", ("engine",))
+db_pool_checked_out = registry.gauge(
+    "db_pool_checked_out", "Connections currently checked out", ("engine",)
+)
+db_pool_overflow = registry.gauge(
+    "db_pool_overflow", "Connections open beyond pool_size", ("engine",)
+)
+db_pool_checkout_seconds = registry.histogram(
+    "db_pool_checkout_seconds",
+    "Time to get a pooled connection (queue wait, plus connect for new ones)",
+    ("engine",),
+)
+db_pool_overflow_connections_total = registry.counter(
+    "db_pool_overflow_connections_total",
+    "Connections opened beyond pool_size",
+    ("engine",),
+)
+db_pool_timeouts_total = registry.counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout",
+    ("engine",),
+)
+db_pool_invalidations_total = registry.counter(
+    "db_pool_invalidations_total",
+    "Pooled connections invalidated (hard: closed now, soft: on next checkin)",
+    ("engine", "kind"),
+)
+db_pool_pre_ping_failures_total = registry.counter(
+    "db_pool_pre_ping_failures_total",
+    "pool_pre_ping checks that found a dead connection",
+    ("engine",),
+)
+
+# Caches (running totals mirrored by collectors)
+cache_requests_total = registry.counter(
+    "cache_requests_total", "Cache lookups by cache and result", ("cache", "result")
+)
+
+# SR sync
+sync_payload_bytes = registry.histogram(
+    "sync_payload_bytes",
+    "Size of the SR sync response data by endpoint",
+    ("endpoint",),
+    buckets=SIZE_BUCKETS,
+)
@@ -3,117 +3,154 @@ import uuid
 import time
 import logging
 from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.core.config import get_settings
+from app.core.metrics import http_request_duration_seconds, http_requests_in_progress
+from app.db.query_stats import begin_query_stats, end_query_stats
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Middleware to add request ID to all requests"""
+def route_template(scope: Scope) -> str:
+    """Path template of the route that handled the request, for metric labels"""
+    route = scope.get("route")
+    path_regex = getattr(route, "path_regex", None)
+    if path_regex is None:
+        return "unmatched"
+    # Routes of an included router can report their path without the include
+    # prefix; the prefix is the part of the path in front of the route's match
+    path = scope["path"]
+    for index, char in enumerate(path):
+        if char == "/" and path_regex.match(path[index:]):
+            return path[:index] + route.path
+    return route.path
+
+
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware: assigns the request ID, logs the request and adds
+    X-Request-ID / X-Process-Time by wrapping send, so the response body
+    (including streaming responses) passes through untouched. SQL run for the
+    request is counted and timed (app/db/query_stats.py), reported in
+    Server-Timing and in the completion log line. Headers are written at
+    response start, so for streamed responses they only cover the SQL run
+    before the first chunk; the log line covers the whole request.
+    Latency and in-flight requests are recorded for /metrics
+    """
+
+    QUIET_PATHS = ("/health", "/ready", "/metrics", "/", "/favicon.ico")
 
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
-
-    async def dispatch(self, request: Request, call_next):
-        # Generate unique request ID
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-
-        # Process request
-        response = await call_next(request)
-
-        # Add request ID to headers for client reference
-        response.headers["X-Request-ID"] = request_id
-
-        return response
-
+        self.app = app
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Enhanced logging middleware with environment-specific behavior"""
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        start_time = time.perf_counter()
+        request_id = str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+        query_stats, query_stats_token = begin_query_stats()
+        http_requests_in_progress.inc()
 
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        request_id = getattr(request.state, "request_id", "unknown")
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        client_ip = client[0] if client else None
 
         # Skip logging for health checks in production to reduce noise
-        should_log_request = True
-        if settings.is_production() and request.url.path in [
-            "/health",
-            "/",
-            "/favicon.ico",
-        ]:
-            should_log_request = False
+        should_log_request = not (settings.is_production() and path in self.QUIET_PATHS)
 
         # Log request start
         if should_log_request:
             log_extra = {
                 "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
-                "client_ip": request.client.host if request.client else None,
+                "method": method,
+                "path": path,
+                "client_ip": client_ip,
             }
 
             # Add more details in development
             if settings.is_development():
+                request_headers = Headers(scope=scope)
                 log_extra.update(
                     {
-                        "query_params": (
-                            str(request.query_params) if request.query_params else None
-                        ),
-                        "user_agent": request.headers.get("user-agent"),
-                        "content_type": request.headers.get("content-type"),
+                        "query_params": scope["query_string"].decode("latin-1") or None,
+                        "user_agent": request_headers.get("user-agent"),
+                        "content_type": request_headers.get("content-type"),
                     }
                 )
 
-            logger.info(
-                f"Request started: {request.method} {request.url.path}", extra=log_extra
+            logger.info(f"Request started: {method} {path}", extra=log_extra)
+
+        status_code = 500
+        response_headers = None
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code, response_headers
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Time to response start; the full duration is logged on completion
+                process_time = time.perf_counter() - start_time
+                response_headers = MutableHeaders(scope=message)
+                response_headers.append("X-Request-ID", request_id)
+                response_headers.append("X-Process-Time", str(round(process_time, 4)))
+                if settings.SERVER_TIMING_ENABLED:
+                    response_headers.append(
+                        "Server-Timing", query_stats.server_timing(process_time)
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_query_stats(query_stats_token)
+            http_requests_in_progress.dec()
+            # Label by route template (not the raw path) to bound cardinality
+            http_request_duration_seconds.observe(
+                time.perf_counter() - start_time,
+                (method, route_template(scope), str(status_code)),
             )
 
-        # Process request
-        response = await call_next(request)
-
-        # Calculate processing time
-        process_time = time.time() - start_time
-
-        # Log response
-        if should_log_request:
-            log_level = logging.WARNING if response.status_code >= 400 else logging.INFO
-
-            log_extra = {
-                "request_id": request_id,
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "process_time": round(process_time, 4),
-                "client_ip": request.client.host if request.client else None,
-            }
-
-            # Add response details in development
-            if settings.is_development():
-                log_extra.update(
-                    {
-                        "content_length": response.headers.get("content-length"),
-                        "content_type": response.headers.get("content-type"),
-                    }
+            # Log response
+            if should_log_request:
+                process_time = time.perf_counter() - start_time
+                log_level = logging.WARNING if status_code >= 400 else logging.INFO
+
+                log_extra = {
+                    "request_id": request_id,
+                    "method": method,
+                    "path": path,
+                    "status_code": status_code,
+                    "process_time": round(process_time, 4),
+                    "client_ip": client_ip,
+                    "db_queries": query_stats.count,
+                    "db_time": round(query_stats.db_time, 4),
+                    "db_rows": query_stats.rows,
+                }
+
+                # Add response details in development
+                if settings.is_development() and response_headers is not None:
+                    log_extra.update(
+                        {
+                            "content_length": response_headers.get("content-length"),
+                            "content_type": response_headers.get("content-type"),
+                        }
+                    )
+
+                logger.log(
+                    log_level,
+                    f"Request completed: {method} {path} - {status_code} "
+                    f"({query_stats.count} queries, "
+                    f"{query_stats.db_time * 1000:.1f} ms db, "
+                    f"{query_stats.rows} rows)",
+                    extra=log_extra,
                 )
 
-            logger.log(
-                log_level,
-                f"Request completed: {request.method} {request.url.path} - {response.status_code}",
-                extra=log_extra,
-            )
-
-        # Add processing time to response headers
-        response.headers["X-Process-Time"] = str(round(process_time, 4))
-
-        return response
-
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     """Add security headers based on environment"""
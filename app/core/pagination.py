@@ -0,0 +1,60 @@
+# app/core/pagination.py
+import base64
+import binascii
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+
+from app.core.exceptions import InvalidCursorException
+
+# Position of the last row of a page: (created_at, id)
+Cursor = Tuple[Optional[datetime], int]
+
+
+def encode_cursor(created_at: Optional[datetime], id: int) -> str:
+    """Opaque, URL-safe cursor for the row a page ended on"""
+    raw = f"{created_at.isoformat() if created_at else ''}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """Inverse of encode_cursor, raises InvalidCursorException on tampered input"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_at, id = raw.split("|")
+        return (datetime.fromisoformat(created_at) if created_at else None, int(id))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorException(cursor)
+
+
+def keyset_order(model):
+    return (model.created_at, model.id)
+
+
+def keyset_after(model, cursor: Cursor):
+    """
+    Rows strictly after the cursor in (created_at, id) order
+    NULL created_at sorts first (MySQL and SQLite), so a NULL cursor continues
+    through the remaining NULL rows and then every dated row
+    """
+    created_at, id = cursor
+    if created_at is None:
+        return or_(
+            and_(model.created_at.is_(None), model.id > id),
+            model.created_at.is_not(None),
+        )
+    return or_(
+        model.created_at > created_at,
+        and_(model.created_at == created_at, model.id > id),
+    )
+
+
+def split_page(rows: Sequence, limit: int) -> Tuple[List, Optional[str]]:
+    """Trim a limit + 1 fetch to the page and build the next cursor if more remain"""
+    page = list(rows[:limit])
+    if len(rows) <= limit:
+        return page, None
+    last = page[-1]
+    return page, encode_cursor(last.created_at, last.id)
@@ -0,0 +1,109 @@
+# app/core/readiness.py
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+from app.db.database import engine, verify_tables, warm_up_pools
+from app.db.query_plans import check_query_plans
+from app.models import Base
+from app.services.dimension_cache import dimension_cache
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class StartupChecks:
+    """
+    Startup work that needs the database, run as a background task so the
+    lifespan returns at once and /health answers while it is in progress:
+    table verification (retried with backoff until the database answers),
+    the optional pool warm-up and EXPLAIN check, and the first dimension
+    cache load. /ready reports 503 until all of them are done
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.attempts = 0
+        self.last_error: Optional[str] = None
+        self.missing_tables: List[str] = []
+        self.ready_at: Optional[datetime] = None
+        self._started = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _verify_database(self):
+        while True:
+            self.attempts += 1
+            try:
+                self.missing_tables = await run_in_threadpool(
+                    verify_tables, engine, Base
+                )
+                self.last_error = None
+                return
+            except Exception as e:
+                self.last_error = str(e) if not settings.is_production() else None
+                delay = min(
+                    5 * self.attempts, settings.STARTUP_CHECK_MAX_BACKOFF_SECONDS
+                )
+                logger.error(
+                    f"Database verification failed (attempt {self.attempts}), "
+                    f"retrying in {delay}s: {e}"
+                )
+                await asyncio.sleep(delay)
+
+    async def _run(self):
+        await self._verify_database()
+
+        if settings.DB_POOL_WARMUP_CONNECTIONS > 0:
+            try:
+                await warm_up_pools(settings.DB_POOL_WARMUP_CONNECTIONS)
+            except Exception as e:
+                logger.error(f"Pool warm-up failed: {e}")
+
+        if settings.EXPLAIN_CHECK_ON_STARTUP:
+            try:
+                await run_in_threadpool(check_query_plans, engine)
+            except Exception as e:
+                logger.error(f"Query plan check failed: {e}")
+
+        if settings.DIMENSION_CACHE_ENABLED:
+            await dimension_cache.start()
+
+        self.ready = True
+        self.ready_at = datetime.now(timezone.utc)
+        logger.info(
+            f"Startup checks passed in {time.monotonic() - self._started:.1f}s, "
+            f"ready for traffic"
+        )
+
+    async def start(self):
+        self._started = time.monotonic()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> Dict[str, Any]:
+        status = {
+            "ready": self.ready,
+            "attempts": self.attempts,
+            "missing_tables": self.missing_tables,
+        }
+        if self.ready_at is not None:
+            status["ready_at"] = self.ready_at.isoformat()
+        if self.last_error:
+            status["last_error"] = self.last_error
+        return status
+
+
+startup_checks = StartupChecks()
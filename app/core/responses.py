@@ -0,0 +1,96 @@
+# app/core/responses.py
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, Optional
+import json
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from app.core.config import get_settings
+from app.schemas.base import SuccessResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+settings = get_settings()
+
+
+def _json_default(value: Any) -> Any:
+    """Types neither encoder handles natively, written the way pydantic's JSON mode does"""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _use_orjson() -> bool:
+    encoder = settings.JSON_ENCODER.lower()
+    if encoder == "orjson" and orjson is None:
+        raise RuntimeError("JSON_ENCODER=orjson but orjson is not installed")
+    return orjson is not None and encoder in ("auto", "orjson")
+
+
+class AppJSONResponse(JSONResponse):
+    """
+    Default response class: orjson when available (JSON_ENCODER), stdlib json
+    otherwise, with Decimal/datetime/date/time support in both
+    """
+
+    use_orjson = _use_orjson()
+
+    def render(self, content: Any) -> bytes:
+        if self.use_orjson:
+            return orjson.dumps(
+                content, default=_json_default, option=orjson.OPT_NON_STR_KEYS
+            )
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+            default=_json_default,
+        ).encode("utf-8")
+
+
+def dump_json(data: Any) -> bytes:
+    """
+    Encode trusted payloads (dicts, lists, models) in one pass with pydantic-core
+    Decimal, datetime and date come out exactly as a response_model would write them
+    """
+    return to_json(data)
+
+
+def success_envelope_prefix(message: str, status_code: int = 200) -> bytes:
+    """SuccessResponse JSON up to and including '"data":', for splicing in data"""
+    envelope = SuccessResponse[None](
+        data=None, message=message, status_code=status_code
+    ).model_dump_json(exclude={"data"})
+    return envelope[:-1].encode() + b',"data":'
+
+
+def success_json_response(
+    data_json: bytes,
+    message: str,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    SuccessResponse envelope around an already serialized data payload
+    Same JSON as returning SuccessResponse(data=...) from a route
+    """
+    body = success_envelope_prefix(message, status_code) + data_json + b"}"
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
@@ -0,0 +1,63 @@
+# app/crud/dimensions.py
+from sqlalchemy.orm import Session
+from sqlalchemy import Row, func, select
+from typing import List, Tuple
+
+from app.models.dimensions import DimCustomDropdown, DimCustomer, DimMara
+
+# Only the columns the dimension cache keeps
+DROPDOWN_COLUMNS = (
+    DimCustomDropdown.id,
+    DimCustomDropdown.name,
+    DimCustomDropdown.value,
+    DimCustomDropdown.module,
+    DimCustomDropdown.active,
+)
+
+MATERIAL_COLUMNS = (
+    DimMara.matnr,
+    DimMara.maktx,
+    DimMara.unit,
+    DimMara.matkl,
+)
+
+CUSTOMER_COLUMNS = (
+    DimCustomer.kunnr,
+    DimCustomer.fspcode,
+    DimCustomer.name,
+    DimCustomer.address,
+    DimCustomer.city,
+)
+
+
+class CRUDDimensions:
+    """Bulk reads of the rarely changing dimension tables"""
+
+    def get_dropdowns(self, db: Session) -> List[Row]:
+        return db.execute(select(*DROPDOWN_COLUMNS)).all()
+
+    def get_materials(self, db: Session) -> List[Row]:
+        return db.execute(select(*MATERIAL_COLUMNS)).all()
+
+    def get_customers(self, db: Session) -> List[Row]:
+        return db.execute(select(*CUSTOMER_COLUMNS)).all()
+
+    def get_change_probe(self, db: Session) -> Tuple:
+        """Row counts and latest change markers of the three tables in one query"""
+        return tuple(
+            db.execute(
+                select(
+                    select(func.count())
+                    .select_from(DimCustomDropdown)
+                    .scalar_subquery(),
+                    select(func.max(DimCustomDropdown.updated_at)).scalar_subquery(),
+                    select(func.count()).select_from(DimMara).scalar_subquery(),
+                    select(func.max(DimMara.updat2)).scalar_subquery(),
+                    select(func.count()).select_from(DimCustomer).scalar_subquery(),
+                    select(func.max(DimCustomer.timestamp)).scalar_subquery(),
+                )
+            ).one()
+        )
+
+
+dimensions_crud = CRUDDimensions()
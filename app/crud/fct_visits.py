@@ -1,5 +1,7 @@
 # app/crud/fct_visits.py
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from typing import List
 
 from app.models.fct_visits import FctVisits
@@ -23,4 +25,28 @@ class CRUDFctVisits:
         return [visit.appkey for visit in visits]
 
 
+class AsyncCRUDFctVisits:
+    def __init__(self, model):
+        self.model = model
+
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> List[FctVisits]:
+        """Get all visits by fspemail or rsmemail"""
+        result = await db.execute(
+            select(self.model).where(
+                (self.model.fspemail == email) | (self.model.rsmemail == email)
+            )
+        )
+        return list(result.scalars().all())
+
+    async def get_keyids_by_email(self, db: AsyncSession, *, email: str) -> List[str]:
+        """Get all keyids for visits by email (for SR header reference)"""
+        result = await db.execute(
+            select(self.model.appkey).where(
+                (self.model.fspemail == email) | (self.model.rsmemail == email)
+            )
+        )
+        return list(result.scalars().all())
+
+
 fct_visits_crud = CRUDFctVisits(FctVisits)
+async_fct_visits_crud = AsyncCRUDFctVisits(FctVisits)
@@ -1,7 +1,9 @@
-# app/crud/sr_attachment.py
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import List, Optional, Tuple
 
+from app.core.pagination import Cursor, keyset_after, keyset_order, split_page
 from app.models.sr_fct_attachment import SrFctAttachment
 from app.models.sr_fct_header import SrFctHeader
 
@@ -19,9 +21,61 @@ class CRUDSrAttachment:
             .all()
         )
 
+    def _page_stmt(self, email: str, cursor: Optional[Cursor], limit: int):
+        stmt = select(self.model).where(
+            self.model.keyid.in_(
+                select(SrFctHeader.keyid).where(
+                    (SrFctHeader.fspemail == email) | (SrFctHeader.rsmemail == email)
+                )
+            )
+        )
+        if cursor is not None:
+            stmt = stmt.where(keyset_after(self.model, cursor))
+        # One extra row tells whether another page exists
+        return stmt.order_by(*keyset_order(self.model)).limit(limit + 1)
+
+    def get_page_by_email(
+        self, db: Session, *, email: str, cursor: Optional[Cursor], limit: int
+    ) -> Tuple[List[SrFctAttachment], Optional[str]]:
+        """Page of the email's attachments in (created_at, id) order, plus the next cursor"""
+        rows = db.execute(self._page_stmt(email, cursor, limit)).scalars().all()
+        return split_page(rows, limit)
+
     def get_by_keyid(self, db: Session, *, keyids: List[str]) -> List[SrFctAttachment]:
         """Get all attachments by list of keyids"""
         return db.query(self.model).filter(self.model.keyid.in_(keyids)).all()
 
 
+class AsyncCRUDSrAttachment(CRUDSrAttachment):
+    """Same attachments queries through an AsyncSession (DB_ASYNC=true)"""
+
+    async def get_by_email(
+        self, db: AsyncSession, *, email: str
+    ) -> List[SrFctAttachment]:
+        """Get all attachments by email through sr_fct_header relationship"""
+        result = await db.execute(
+            select(self.model)
+            .join(SrFctHeader, self.model.keyid == SrFctHeader.keyid)
+            .where((SrFctHeader.fspemail == email) | (SrFctHeader.rsmemail == email))
+        )
+        return list(result.scalars().all())
+
+    async def get_page_by_email(
+        self, db: AsyncSession, *, email: str, cursor: Optional[Cursor], limit: int
+    ) -> Tuple[List[SrFctAttachment], Optional[str]]:
+        """Page of the email's attachments in (created_at, id) order, plus the next cursor"""
+        result = await db.execute(self._page_stmt(email, cursor, limit))
+        return split_page(result.scalars().all(), limit)
+
+    async def get_by_keyid(
+        self, db: AsyncSession, *, keyids: List[str]
+    ) -> List[SrFctAttachment]:
+        """Get all attachments by list of keyids"""
+        result = await db.execute(
+            select(self.model).where(self.model.keyid.in_(keyids))
+        )
+        return list(result.scalars().all())
+
+
 sr_attachment_crud = CRUDSrAttachment(SrFctAttachment)
+async_sr_attachment_crud = AsyncCRUDSrAttachment(SrFctAttachment)
@@ -0,0 +1,85 @@
+# app/crud/sr_freshness.py
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, or_, select
+from typing import Dict, Tuple
+
+from app.models.sr_fct_header import SrFctHeader
+from app.models.sr_fct_items import SrFctItems
+from app.models.sr_fct_attachment import SrFctAttachment
+from app.models.fct_visits import FctVisits
+
+# table -> (row count, max of each update marker)
+Freshness = Dict[str, Tuple]
+
+# table -> number of probe columns, in _probe_stmt order
+FRESHNESS_TABLES = (("headers", 3), ("items", 3), ("attachments", 3), ("visits", 2))
+
+
+class CRUDSrFreshness:
+    """
+    Cheap freshness probe for an email's SR data: row counts and latest
+    update timestamps of the header/item/attachment tables and of the visits
+    the headers take their customer fields from, in one query
+    """
+
+    def _email_filter(self, email: str):
+        return or_(SrFctHeader.fspemail == email, SrFctHeader.rsmemail == email)
+
+    def _aggregates(self, model, criteria, markers):
+        return [
+            select(func.count()).select_from(model).where(criteria).scalar_subquery(),
+            *(
+                select(func.max(marker)).where(criteria).scalar_subquery()
+                for marker in markers
+            ),
+        ]
+
+    def _timestamps(self, model):
+        return (model.updated_at, model.m_updated_at)
+
+    def _probe_stmt(self, email: str):
+        user_keyids = select(SrFctHeader.keyid).where(self._email_filter(email))
+        return select(
+            *self._aggregates(
+                SrFctHeader, self._email_filter(email), self._timestamps(SrFctHeader)
+            ),
+            *self._aggregates(
+                SrFctItems,
+                SrFctItems.keyid.in_(user_keyids),
+                self._timestamps(SrFctItems),
+            ),
+            *self._aggregates(
+                SrFctAttachment,
+                SrFctAttachment.keyid.in_(user_keyids),
+                self._timestamps(SrFctAttachment),
+            ),
+            # keyid in sr_fct_header references appkey in fct_visits
+            *self._aggregates(
+                FctVisits, FctVisits.appkey.in_(user_keyids), (FctVisits.updatedate,)
+            ),
+        )
+
+    def _to_freshness(self, row) -> Freshness:
+        values = tuple(row)
+        freshness = {}
+        start = 0
+        for table, width in FRESHNESS_TABLES:
+            freshness[table] = values[start : start + width]
+            start += width
+        return freshness
+
+    def get_by_email(self, db: Session, *, email: str) -> Freshness:
+        """Counts and latest timestamps per table for the email"""
+        return self._to_freshness(db.execute(self._probe_stmt(email)).one())
+
+
+class AsyncCRUDSrFreshness(CRUDSrFreshness):
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> Freshness:
+        """Counts and latest timestamps per table for the email"""
+        result = await db.execute(self._probe_stmt(email))
+        return self._to_freshness(result.one())
+
+
+sr_freshness_crud = CRUDSrFreshness()
+async_sr_freshness_crud = AsyncCRUDSrFreshness()
@@ -1,7 +1,9 @@
-# app/crud/sr_header.py
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import List, Optional, Tuple
 
+from app.core.pagination import Cursor, keyset_after, keyset_order, split_page
 from app.models.sr_fct_header import SrFctHeader
 
 
@@ -17,9 +19,51 @@ class CRUDSrHeader:
             .all()
         )
 
+    def _page_stmt(self, email: str, cursor: Optional[Cursor], limit: int):
+        stmt = select(self.model).where(
+            (self.model.fspemail == email) | (self.model.rsmemail == email)
+        )
+        if cursor is not None:
+            stmt = stmt.where(keyset_after(self.model, cursor))
+        # One extra row tells whether another page exists
+        return stmt.order_by(*keyset_order(self.model)).limit(limit + 1)
+
+    def get_page_by_email(
+        self, db: Session, *, email: str, cursor: Optional[Cursor], limit: int
+    ) -> Tuple[List[SrFctHeader], Optional[str]]:
+        """Page of headers by fspemail or rsmemail in (created_at, id) order, plus the next cursor"""
+        rows = db.execute(self._page_stmt(email, cursor, limit)).scalars().all()
+        return split_page(rows, limit)
+
     def get_by_keyid(self, db: Session, *, keyid: str) -> List[SrFctHeader]:
         """Get headers by keyid (references fct_visits.appkey)"""
         return db.query(self.model).filter(self.model.keyid == keyid).all()
 
 
+class AsyncCRUDSrHeader(CRUDSrHeader):
+    """Same headers queries through an AsyncSession (DB_ASYNC=true)"""
+
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> List[SrFctHeader]:
+        """Get all headers by fspemail or rsmemail"""
+        result = await db.execute(
+            select(self.model).where(
+                (self.model.fspemail == email) | (self.model.rsmemail == email)
+            )
+        )
+        return list(result.scalars().all())
+
+    async def get_page_by_email(
+        self, db: AsyncSession, *, email: str, cursor: Optional[Cursor], limit: int
+    ) -> Tuple[List[SrFctHeader], Optional[str]]:
+        """Page of headers by fspemail or rsmemail in (created_at, id) order, plus the next cursor"""
+        result = await db.execute(self._page_stmt(email, cursor, limit))
+        return split_page(result.scalars().all(), limit)
+
+    async def get_by_keyid(self, db: AsyncSession, *, keyid: str) -> List[SrFctHeader]:
+        """Get headers by keyid (references fct_visits.appkey)"""
+        result = await db.execute(select(self.model).where(self.model.keyid == keyid))
+        return list(result.scalars().all())
+
+
 sr_header_crud = CRUDSrHeader(SrFctHeader)
+async_sr_header_crud = AsyncCRUDSrHeader(SrFctHeader)
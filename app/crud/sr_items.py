@@ -1,7 +1,9 @@
-# app/crud/sr_items.py
 from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import List, Optional, Tuple
 
+from app.core.pagination import Cursor, keyset_after, keyset_order, split_page
 from app.models.sr_fct_items import SrFctItems
 from app.models.sr_fct_header import SrFctHeader
 
@@ -19,9 +21,59 @@ class CRUDSrItems:
             .all()
         )
 
+    def _page_stmt(self, email: str, cursor: Optional[Cursor], limit: int):
+        stmt = select(self.model).where(
+            self.model.keyid.in_(
+                select(SrFctHeader.keyid).where(
+                    (SrFctHeader.fspemail == email) | (SrFctHeader.rsmemail == email)
+                )
+            )
+        )
+        if cursor is not None:
+            stmt = stmt.where(keyset_after(self.model, cursor))
+        # One extra row tells whether another page exists
+        return stmt.order_by(*keyset_order(self.model)).limit(limit + 1)
+
+    def get_page_by_email(
+        self, db: Session, *, email: str, cursor: Optional[Cursor], limit: int
+    ) -> Tuple[List[SrFctItems], Optional[str]]:
+        """Page of the email's items in (created_at, id) order, plus the next cursor"""
+        rows = db.execute(self._page_stmt(email, cursor, limit)).scalars().all()
+        return split_page(rows, limit)
+
     def get_by_keyid(self, db: Session, *, keyids: List[str]) -> List[SrFctItems]:
         """Get all items by list of keyids"""
         return db.query(self.model).filter(self.model.keyid.in_(keyids)).all()
 
 
+class AsyncCRUDSrItems(CRUDSrItems):
+    """Same items queries through an AsyncSession (DB_ASYNC=true)"""
+
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> List[SrFctItems]:
+        """Get all items by email through sr_fct_header relationship"""
+        result = await db.execute(
+            select(self.model)
+            .join(SrFctHeader, self.model.keyid == SrFctHeader.keyid)
+            .where((SrFctHeader.fspemail == email) | (SrFctHeader.rsmemail == email))
+        )
+        return list(result.scalars().all())
+
+    async def get_page_by_email(
+        self, db: AsyncSession, *, email: str, cursor: Optional[Cursor], limit: int
+    ) -> Tuple[List[SrFctItems], Optional[str]]:
+        """Page of the email's items in (created_at, id) order, plus the next cursor"""
+        result = await db.execute(self._page_stmt(email, cursor, limit))
+        return split_page(result.scalars().all(), limit)
+
+    async def get_by_keyid(
+        self, db: AsyncSession, *, keyids: List[str]
+    ) -> List[SrFctItems]:
+        """Get all items by list of keyids"""
+        result = await db.execute(
+            select(self.model).where(self.model.keyid.in_(keyids))
+        )
+        return list(result.scalars().all())
+
+
 sr_items_crud = CRUDSrItems(SrFctItems)
+async_sr_items_crud = AsyncCRUDSrItems(SrFctItems)
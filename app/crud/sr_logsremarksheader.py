@@ -1,5 +1,7 @@
 # app/crud/sr_logsremarksheader.py
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from typing import List
 
 from app.models.sr_fct_logsremarksheader import SrFctLogsRemarksHeader
@@ -10,20 +12,44 @@ class CRUDSrLogsRemarksHeader:
     def __init__(self, model):
         self.model = model
 
+    def _by_email_stmt(self, email: str):
+        # IN instead of a join so each log comes back once
+        header_keyids = select(SrFctHeader.keyid).where(
+            (SrFctHeader.fspemail == email) | (SrFctHeader.rsmemail == email)
+        )
+        return select(self.model).where(self.model.keyid.in_(header_keyids))
+
+    def _by_keyids_stmt(self, keyids: List[str]):
+        return select(self.model).where(self.model.keyid.in_(keyids))
+
     def get_by_email(self, db: Session, *, email: str) -> List[SrFctLogsRemarksHeader]:
         """Get all header logs by email through sr_fct_header relationship"""
-        return (
-            db.query(self.model)
-            .join(SrFctHeader, self.model.keyid == SrFctHeader.keyid)
-            .filter((SrFctHeader.fspemail == email) | (SrFctHeader.rsmemail == email))
-            .all()
-        )
+        return list(db.execute(self._by_email_stmt(email)).scalars().all())
 
     def get_by_keyids(
         self, db: Session, *, keyids: List[str]
     ) -> List[SrFctLogsRemarksHeader]:
         """Get all header logs by list of keyids"""
-        return db.query(self.model).filter(self.model.keyid.in_(keyids)).all()
+        return list(db.execute(self._by_keyids_stmt(keyids)).scalars().all())
+
+
+class AsyncCRUDSrLogsRemarksHeader(CRUDSrLogsRemarksHeader):
+    """Same header logs queries through an AsyncSession (DB_ASYNC=true)"""
+
+    async def get_by_email(
+        self, db: AsyncSession, *, email: str
+    ) -> List[SrFctLogsRemarksHeader]:
+        """Get all header logs by email through sr_fct_header relationship"""
+        result = await db.execute(self._by_email_stmt(email))
+        return list(result.scalars().all())
+
+    async def get_by_keyids(
+        self, db: AsyncSession, *, keyids: List[str]
+    ) -> List[SrFctLogsRemarksHeader]:
+        """Get all header logs by list of keyids"""
+        result = await db.execute(self._by_keyids_stmt(keyids))
+        return list(result.scalars().all())
 
 
 sr_logsremarksheader_crud = CRUDSrLogsRemarksHeader(SrFctLogsRemarksHeader)
+async_sr_logsremarksheader_crud = AsyncCRUDSrLogsRemarksHeader(SrFctLogsRemarksHeader)
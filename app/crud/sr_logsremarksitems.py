@@ -1,5 +1,7 @@
 # app/crud/sr_logsremarksitems.py
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from typing import List
 
 from app.models.sr_fct_logsremarksitems import SrFctLogsRemarksItems
@@ -11,21 +13,48 @@ class CRUDSrLogsRemarksItems:
     def __init__(self, model):
         self.model = model
 
+    def _by_email_stmt(self, email: str):
+        # keyid references sr_fct_items.appkey; IN instead of joins so each log
+        # comes back once
+        header_keyids = select(SrFctHeader.keyid).where(
+            (SrFctHeader.fspemail == email) | (SrFctHeader.rsmemail == email)
+        )
+        item_appkeys = select(SrFctItems.appkey).where(
+            SrFctItems.keyid.in_(header_keyids)
+        )
+        return select(self.model).where(self.model.keyid.in_(item_appkeys))
+
+    def _by_keyids_stmt(self, keyids: List[str]):
+        return select(self.model).where(self.model.keyid.in_(keyids))
+
     def get_by_email(self, db: Session, *, email: str) -> List[SrFctLogsRemarksItems]:
         """Get all items logs by email through sr_fct_items -> sr_fct_header relationship"""
-        return (
-            db.query(self.model)
-            .join(SrFctItems, self.model.keyid == SrFctItems.keyid)
-            .join(SrFctHeader, SrFctItems.keyid == SrFctHeader.keyid)
-            .filter((SrFctHeader.fspemail == email) | (SrFctHeader.rsmemail == email))
-            .all()
-        )
+        return list(db.execute(self._by_email_stmt(email)).scalars().all())
 
     def get_by_keyids(
         self, db: Session, *, keyids: List[str]
     ) -> List[SrFctLogsRemarksItems]:
         """Get all items logs by list of keyids"""
-        return db.query(self.model).filter(self.model.keyid.in_(keyids)).all()
+        return list(db.execute(self._by_keyids_stmt(keyids)).scalars().all())
+
+
+class AsyncCRUDSrLogsRemarksItems(CRUDSrLogsRemarksItems):
+    """Same items logs queries through an AsyncSession (DB_ASYNC=true)"""
+
+    async def get_by_email(
+        self, db: AsyncSession, *, email: str
+    ) -> List[SrFctLogsRemarksItems]:
+        """Get all items logs by email through sr_fct_items -> sr_fct_header relationship"""
+        result = await db.execute(self._by_email_stmt(email))
+        return list(result.scalars().all())
+
+    async def get_by_keyids(
+        self, db: AsyncSession, *, keyids: List[str]
+    ) -> List[SrFctLogsRemarksItems]:
+        """Get all items logs by list of keyids"""
+        result = await db.execute(self._by_keyids_stmt(keyids))
+        return list(result.scalars().all())
 
 
 sr_logsremarksitems_crud = CRUDSrLogsRemarksItems(SrFctLogsRemarksItems)
+async_sr_logsremarksitems_crud = AsyncCRUDSrLogsRemarksItems(SrFctLogsRemarksItems)
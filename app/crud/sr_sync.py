@@ -1,158 +1,880 @@
 # app/crud/sr_sync.py
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, and_, or_, select
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+import hashlib
 import logging
+import threading
 
 from app.models.sr_fct_header import SrFctHeader
 from app.models.sr_fct_items import SrFctItems
 from app.models.sr_fct_attachment import SrFctAttachment
 from app.models.fct_visits import FctVisits
-from app.schemas.sr_sync import SrSyncHeaderData, SrSyncItemData, UserData
+from app.core.config import get_settings
+from app.core.metrics import registry, cache_requests_total
+from app.core.responses import dump_json
+from app.schemas.sr_sync import SrSyncItemData, UserData
+from app.services.dimension_cache import dimension_cache
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# fk_actiontype values in dim_custom_dropdown
+RETURN_ACTION_TYPE = 251
+REPLACE_ACTION_TYPE = 252
+
+# fk_* id on the header -> label field added by enrichment
+HEADER_LABEL_FIELDS = (
+    ("fk_typerequest", "type_request"),
+    ("fk_reasonreturn", "reason_return"),
+    ("fk_modereturn", "mode_return"),
+    ("fk_status", "status"),
+    ("fk_srrtype", "srr_type"),
+)
+
+# Only the columns SrSyncHeaderData/SrSyncItemData/attachments read, fetched as
+# plain rows instead of full ORM entities
+SYNC_HEADER_COLUMNS = (
+    SrFctHeader.appkey,
+    SrFctHeader.keyid,
+    SrFctHeader.fk_typerequest,
+    SrFctHeader.fk_reasonreturn,
+    SrFctHeader.fk_modereturn,
+    SrFctHeader.fk_status,
+    SrFctHeader.fk_srrtype,
+    SrFctHeader.code,
+    SrFctHeader.created_at,
+    SrFctHeader.updated_shiptocode,
+    SrFctHeader.sdo_pao_remarks,
+    SrFctHeader.ssa_remarks,
+    SrFctHeader.approver_remarks,
+    SrFctHeader.remarks_return,
+    SrFctHeader.fspemail,
+    SrFctHeader.rsmemail,
+    SrFctHeader.updated_at,
+    SrFctHeader.m_updated_at,
+)
+
+SYNC_ITEM_COLUMNS = (
+    SrFctItems.id,
+    SrFctItems.appkey,
+    SrFctItems.keyid,
+    SrFctItems.matnr,
+    SrFctItems.fk_actiontype,
+    SrFctItems.discount,
+    SrFctItems.qty,
+    SrFctItems.srp,
+    SrFctItems.total_amount,
+    SrFctItems.net_price,
+    SrFctItems.net_total_amount,
+    SrFctItems.fsp_remarks,
+    SrFctItems.ssa_remarks,
+    SrFctItems.dr_number,
+    SrFctItems.dr_date,
+    SrFctItems.code,
+    SrFctItems.is_sdo,
+    SrFctItems.updated_at,
+    SrFctItems.m_updated_at,
+)
+
+SYNC_ATTACHMENT_COLUMNS = (
+    SrFctAttachment.appkey,
+    SrFctAttachment.keyid,
+    SrFctAttachment.image,
+    SrFctAttachment.file_name,
+    SrFctAttachment.file_path,
+    SrFctAttachment.created_at,
+    SrFctAttachment.is_active,
+    SrFctAttachment.updated_at,
+    SrFctAttachment.m_updated_at,
+)
+
+SYNC_VISIT_COLUMNS = (
+    FctVisits.appkey,
+    FctVisits.kunnr,
+    FctVisits.name,
+    FctVisits.address,
+)
+
+
+class HeaderHashCache:
+    """
+    Bounded LRU of appkey -> (row fingerprint, content hash)
+    The content hash is only recomputed when the header, item, attachment or
+    visit rows behind a header differ from the ones it was computed from
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, appkey: str, fingerprint: int) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(appkey)
+            if entry is None or entry[0] != fingerprint:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(appkey)
+            return entry[1]
+
+    def set(self, appkey: str, fingerprint: int, digest: str) -> None:
+        with self._lock:
+            self._entries[appkey] = (fingerprint, digest)
+            self._entries.move_to_end(appkey)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+header_hash_cache = HeaderHashCache(settings.SYNC_HASH_CACHE_SIZE)
+
+
+def collect_hash_cache_metrics():
+    cache_requests_total.set_total(header_hash_cache.hits, ("header_hash", "hit"))
+    cache_requests_total.set_total(header_hash_cache.misses, ("header_hash", "miss"))
+
+
+registry.add_collector(collect_hash_cache_metrics)
 
 
 class CRUDSrSync:
     def __init__(self):
         pass
 
-    def _get_user_role(self, email: str, header: SrFctHeader) -> str:
+    def _get_user_role(self, email: str, header: Row) -> str:
         """Determine user role based on email matching (without ssaemail for now)"""
-        if email == header.fspemail:
+        email = email.casefold()
+        if email == (header.fspemail or "").casefold():
             return "requestor"
-        elif email == header.rsmemail:
+        elif email == (header.rsmemail or "").casefold():
             return "validator"
         # Note: ssaemail removed for now - will be added in further enhancements
         else:
             return "unknown"
 
+    def _email_filter(self, email: str):
+        """Headers where the email is the requestor or validator"""
+        # Removed ssaemail for now
+        return or_(
+            SrFctHeader.fspemail == email,
+            SrFctHeader.rsmemail == email,
+            # SrFctHeader.ssaemail == email  # Removed for now - future enhancement
+        )
+
+    def _changed_since(self, model, updated_since: datetime):
+        """
+        Inclusive on purpose: a row written later in the same second as the
+        watermark would be missed by >, so rows at the watermark are sent
+        again and clients de-duplicate by appkey
+        """
+        return or_(
+            model.updated_at >= updated_since, model.m_updated_at >= updated_since
+        )
+
+    def _headers_stmt(self, email: str):
+        return select(*SYNC_HEADER_COLUMNS).where(self._email_filter(email))
+
+    def _batch_headers_stmt(self, emails: List[str]):
+        """Headers for any of the emails, as requestor or validator"""
+        return select(*SYNC_HEADER_COLUMNS).where(
+            or_(SrFctHeader.fspemail.in_(emails), SrFctHeader.rsmemail.in_(emails))
+        )
+
+    def _user_stmt(self, email: str):
+        return (
+            select(SrFctHeader.code, SrFctHeader.fspemail, SrFctHeader.rsmemail)
+            .where(self._email_filter(email))
+            .limit(1)
+        )
+
+    def _delta_headers_stmt(self, email: str, updated_since: datetime):
+        """Headers changed after the watermark, or whose items changed"""
+        changed_item_keyids = select(SrFctItems.keyid).where(
+            self._changed_since(SrFctItems, updated_since)
+        )
+        return select(*SYNC_HEADER_COLUMNS).where(
+            self._email_filter(email),
+            or_(
+                self._changed_since(SrFctHeader, updated_since),
+                SrFctHeader.keyid.in_(changed_item_keyids),
+            ),
+        )
+
+    def _delta_attachments_stmt(self, email: str, updated_since: datetime):
+        """Attachments of the user's headers changed after the watermark"""
+        user_keyids = select(SrFctHeader.keyid).where(self._email_filter(email))
+        return select(*SYNC_ATTACHMENT_COLUMNS).where(
+            SrFctAttachment.keyid.in_(user_keyids),
+            self._changed_since(SrFctAttachment, updated_since),
+        )
+
+    def _header_chunk_stmt(self, email: str, after_id: int, limit: int):
+        """Next page of headers by primary key, for streaming"""
+        return (
+            select(SrFctHeader.id, *SYNC_HEADER_COLUMNS)
+            .where(self._email_filter(email), SrFctHeader.id > after_id)
+            .order_by(SrFctHeader.id)
+            .limit(limit)
+        )
+
+    def _attachment_chunk_stmt(self, email: str, after_id: int, limit: int):
+        """Next page of the user's attachments by primary key, for streaming"""
+        user_keyids = select(SrFctHeader.keyid).where(self._email_filter(email))
+        return (
+            select(SrFctAttachment.id, *SYNC_ATTACHMENT_COLUMNS)
+            .where(
+                SrFctAttachment.keyid.in_(user_keyids), SrFctAttachment.id > after_id
+            )
+            .order_by(SrFctAttachment.id)
+            .limit(limit)
+        )
+
+    def _items_stmt(self, keyids: List[str]):
+        return select(*SYNC_ITEM_COLUMNS).where(SrFctItems.keyid.in_(keyids))
+
+    def _attachments_stmt(self, keyids: List[str]):
+        return select(*SYNC_ATTACHMENT_COLUMNS).where(SrFctAttachment.keyid.in_(keyids))
+
+    def _visits_stmt(self, keyids: List[str]):
+        # keyid in sr_fct_header references appkey in fct_visits
+        return select(*SYNC_VISIT_COLUMNS).where(FctVisits.appkey.in_(keyids))
+
+    def _group_by_keyid(
+        self, items: Sequence[Row], attachments: Sequence[Row]
+    ) -> Tuple[Dict[Tuple[str, int], List[Row]], Dict[str, List[Row]]]:
+        """Single pass bucketing of items by (keyid, fk_actiontype) and attachments by keyid"""
+        items_by_key = defaultdict(list)
+        for item in items:
+            items_by_key[(item.keyid, item.fk_actiontype)].append(item)
+
+        attachments_by_keyid = defaultdict(list)
+        for att in attachments:
+            attachments_by_keyid[att.keyid].append(att)
+
+        return items_by_key, attachments_by_keyid
+
+    def _header_data(
+        self,
+        header: Row,
+        visit: Optional[Row],
+        items_by_key: Dict[Tuple[str, int], List[Row]],
+    ) -> Dict[str, Any]:
+        """
+        Build one header with its return/replace items and visit customer info
+        Rows come straight from the database, so the SrSyncHeaderData-shaped dict
+        is built without pydantic validation and encoded once by the route
+        """
+        # Separate return and replace items based on fk_actiontype
+        return_items = [
+            SrSyncItemData.payload_from_sr_item(item)
+            for item in items_by_key.get((header.keyid, RETURN_ACTION_TYPE), ())
+        ]
+
+        replace_items = [
+            SrSyncItemData.payload_from_sr_item(item)
+            for item in items_by_key.get((header.keyid, REPLACE_ACTION_TYPE), ())
+        ]
+
+        return {
+            "appkey": header.appkey,
+            "keyid": header.keyid,
+            "fk_typerequest": header.fk_typerequest,
+            "fk_reasonreturn": header.fk_reasonreturn,
+            "fk_modereturn": header.fk_modereturn,
+            "fk_status": header.fk_status,
+            "fk_srrtype": header.fk_srrtype,
+            "code": header.code,
+            "created_at": header.created_at,
+            # Map FctVisits fields correctly: kunnr->customer_code, name->customer_name, address->customer_address
+            "customer_code": visit.kunnr if visit else "",
+            "customer_name": visit.name if visit else "",
+            "customer_address": visit.address if visit else "",
+            "ship_name": (
+                visit.name if visit else ""
+            ),  # Same as customer_name from visits
+            "ship_to": (
+                visit.kunnr if visit else ""
+            ),  # Same as customer_code from visits
+            "updated_shiptocode": header.updated_shiptocode,
+            "sdo_pao_remarks": header.sdo_pao_remarks,
+            "ssa_remarks": header.ssa_remarks,
+            "approver_remarks": header.approver_remarks,
+            "remarks_return": header.remarks_return,
+            "return_items": return_items,
+            "replace_items": replace_items,
+        }
+
+    def enrich_header(self, header_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Add dropdown labels and material descriptions from the dimension cache"""
+        for fk_field, label_field in HEADER_LABEL_FIELDS:
+            label = dimension_cache.dropdown(header_data[fk_field])
+            header_data[label_field] = (
+                {"name": label.name, "value": label.value} if label else None
+            )
+        for items in (header_data["return_items"], header_data["replace_items"]):
+            for item_data in items:
+                material = dimension_cache.material(item_data["matnr"])
+                item_data["maktx"] = material.maktx if material else None
+                item_data["unit"] = material.unit if material else None
+        return header_data
+
+    def enrich_sr_data(self, sr_data: Dict) -> Dict:
+        """Opt-in enrichment of every header in a sync payload, in place (no SQL)"""
+        for header_data in sr_data["header"]:
+            self.enrich_header(header_data)
+        return sr_data
+
+    def _content_hash(
+        self, header_data: Dict[str, Any], attachments: Sequence[Row]
+    ) -> str:
+        """Hash of the serialized header payload and its attachments"""
+        payload = {
+            "header": header_data,
+            "attachments": [self._attachment_data(att) for att in attachments],
+        }
+        return hashlib.blake2b(dump_json(payload), digest_size=16).hexdigest()
+
+    def _header_hash(
+        self,
+        header: Row,
+        visit: Optional[Row],
+        items_by_key: Dict[Tuple[str, int], List[Row]],
+        attachments: Sequence[Row],
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Cached content hash of a header, plus the built header on a cache miss"""
+        fingerprint = hash(
+            (
+                header,
+                tuple(items_by_key.get((header.keyid, RETURN_ACTION_TYPE), ())),
+                tuple(items_by_key.get((header.keyid, REPLACE_ACTION_TYPE), ())),
+                tuple(attachments),
+                visit,
+            )
+        )
+        digest = header_hash_cache.get(header.appkey, fingerprint)
+        if digest is not None:
+            return digest, None
+
+        header_data = self._header_data(header, visit, items_by_key)
+        digest = self._content_hash(header_data, attachments)
+        header_hash_cache.set(header.appkey, fingerprint, digest)
+        return digest, header_data
+
+    def _attachment_data(self, att: Row) -> Dict:
+        return {
+            "appkey": att.appkey,
+            "keyid": att.keyid,
+            "file_name": att.file_name
+            or att.image,  # Use file_name or fallback to image
+            "file_path": att.file_path or "",
+            "file_size": getattr(
+                att, "file_size", None
+            ),  # May not exist in current model
+            "file_type": getattr(
+                att, "file_type", None
+            ),  # May not exist in current model
+            "uploaded_at": (att.created_at.isoformat() if att.created_at else None),
+        }
+
+    def _is_deactivated(self, att: Row) -> bool:
+        return att.is_active is not None and not att.is_active
+
+    def _watermark(
+        self, updated_since: Optional[datetime], *row_groups: Sequence[Row]
+    ) -> Optional[datetime]:
+        """Latest updated_at/m_updated_at seen, never earlier than updated_since"""
+        watermark = updated_since
+        for rows in row_groups:
+            for row in rows:
+                for stamp in (row.updated_at, row.m_updated_at):
+                    if stamp and (watermark is None or stamp > watermark):
+                        watermark = stamp
+        return watermark
+
+    def _normalize_since(self, updated_since: datetime) -> datetime:
+        """Timestamps are stored as naive UTC, convert aware watermarks to match"""
+        if updated_since.tzinfo is not None:
+            return updated_since.astimezone(timezone.utc).replace(tzinfo=None)
+        return updated_since
+
+    def _user_data(self, email: str, user_row: Optional[Row]) -> UserData:
+        if user_row is None:
+            return UserData(email=email, code="", user_role="unknown")
+        return UserData(
+            email=email,
+            code=user_row.code,
+            user_role=self._get_user_role(email, user_row),
+        )
+
+    def _header_chunk_data(
+        self, headers: Sequence[Row], items: Sequence[Row], visits: Sequence[Row]
+    ) -> List[Dict[str, Any]]:
+        visit_map = {visit.appkey: visit for visit in visits}
+        items_by_key, _ = self._group_by_keyid(items, ())
+        return [
+            self._header_data(header, visit_map.get(header.keyid), items_by_key)
+            for header in headers
+        ]
+
+    def _empty_sr_data(
+        self, email: str, updated_since: Optional[datetime] = None
+    ) -> Dict:
+        return {
+            "user": UserData(email=email, code="", user_role="unknown"),
+            "header": [],
+            "attachments": [],
+            "deleted_attachments": [],
+            "watermark": updated_since,
+        }
+
+    def _fetch_sr_rows(self, db: Session, email: str) -> Tuple[Sequence[Row], ...]:
+        """Headers for the email plus their items, attachments and visits"""
+        headers = db.execute(self._headers_stmt(email)).all()
+
+        if not headers:
+            return headers, [], [], []
+
+        # Get all keyids from headers
+        keyids = [header.keyid for header in headers]
+
+        items = db.execute(self._items_stmt(keyids)).all()
+        attachments = db.execute(self._attachments_stmt(keyids)).all()
+        visits = db.execute(self._visits_stmt(keyids)).all()
+
+        return headers, items, attachments, visits
+
     def get_sr_data_by_email(self, db: Session, *, email: str) -> Dict:
         """Get all SR data structured according to the required JSON format"""
+        headers, items, attachments, visits = self._fetch_sr_rows(db, email)
 
-        # Base query for headers - removed ssaemail for now
-        headers = (
-            db.query(SrFctHeader)
-            .filter(
-                or_(
-                    SrFctHeader.fspemail == email,
-                    SrFctHeader.rsmemail == email,
-                    # SrFctHeader.ssaemail == email  # Removed for now - future enhancement
-                )
+        if not headers:
+            return self._empty_sr_data(email)
+
+        return self._build_sr_data(email, headers, items, attachments, visits)
+
+    def _build_batch_data(
+        self,
+        emails: List[str],
+        headers: Sequence[Row],
+        items: Sequence[Row],
+        attachments: Sequence[Row],
+        visits: Sequence[Row],
+    ) -> Dict[str, Dict]:
+        """Split the shared batch rows per email and build each sync payload"""
+        items_by_keyid = defaultdict(list)
+        for item in items:
+            items_by_keyid[item.keyid].append(item)
+        attachments_by_keyid = defaultdict(list)
+        for att in attachments:
+            attachments_by_keyid[att.keyid].append(att)
+        visit_map = {visit.appkey: visit for visit in visits}
+
+        # Emails compare case-insensitively (as the MySQL collation does), rows
+        # are grouped by the casefolded email and returned under the client's
+        # spelling. A header can belong to two requested emails (requestor and
+        # validator)
+        headers_by_email: Dict[str, List[Row]] = {
+            email.casefold(): [] for email in emails
+        }
+        for header in headers:
+            for folded in {
+                (header.fspemail or "").casefold(),
+                (header.rsmemail or "").casefold(),
+            }:
+                if folded in headers_by_email:
+                    headers_by_email[folded].append(header)
+
+        batch_data = {}
+        for email in emails:
+            email_headers = headers_by_email[email.casefold()]
+            if not email_headers:
+                batch_data[email] = self._empty_sr_data(email)
+                continue
+            keyids = list(dict.fromkeys(header.keyid for header in email_headers))
+            batch_data[email] = self._build_sr_data(
+                email,
+                email_headers,
+                [item for keyid in keyids for item in items_by_keyid.get(keyid, ())],
+                [
+                    att
+                    for keyid in keyids
+                    for att in attachments_by_keyid.get(keyid, ())
+                ],
+                [visit_map[keyid] for keyid in keyids if keyid in visit_map],
             )
-            .all()
+        return batch_data
+
+    def get_sr_data_by_emails(
+        self, db: Session, *, emails: List[str]
+    ) -> Dict[str, Dict]:
+        """
+        Full sync payloads for several emails with four set-based queries
+        (headers IN emails, then shared items/attachments/visits IN keyids)
+        """
+        headers = db.execute(self._batch_headers_stmt(emails)).all()
+        keyids = list(dict.fromkeys(header.keyid for header in headers))
+        if not keyids:
+            return self._build_batch_data(emails, headers, [], [], [])
+
+        items = db.execute(self._items_stmt(keyids)).all()
+        attachments = db.execute(self._attachments_stmt(keyids)).all()
+        visits = db.execute(self._visits_stmt(keyids)).all()
+        return self._build_batch_data(emails, headers, items, attachments, visits)
+
+    def get_user_by_email(self, db: Session, *, email: str) -> Optional[UserData]:
+        """User info from the first matching header, None if the email has no SR data"""
+        user_row = db.execute(self._user_stmt(email)).first()
+        return self._user_data(email, user_row) if user_row is not None else None
+
+    def iter_sr_data_by_email(
+        self, db: Session, *, email: str, chunk_size: int
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Chunked full sync for streaming responses
+        Headers (with their items) and then attachments are paged by id so only
+        one chunk is held in memory. Yields ("header", dict),
+        ("attachment", dict) and finally ("watermark", datetime)
+        """
+        watermark = None
+
+        after_id = 0
+        while True:
+            headers = db.execute(
+                self._header_chunk_stmt(email, after_id, chunk_size)
+            ).all()
+            if not headers:
+                break
+            keyids = list(dict.fromkeys(header.keyid for header in headers))
+            items = db.execute(self._items_stmt(keyids)).all()
+            visits = db.execute(self._visits_stmt(keyids)).all()
+
+            watermark = self._watermark(watermark, headers, items)
+            for header_data in self._header_chunk_data(headers, items, visits):
+                yield "header", header_data
+
+            if len(headers) < chunk_size:
+                break
+            after_id = headers[-1].id
+
+        after_id = 0
+        while True:
+            attachments = db.execute(
+                self._attachment_chunk_stmt(email, after_id, chunk_size)
+            ).all()
+            if not attachments:
+                break
+            watermark = self._watermark(watermark, attachments)
+            for att in attachments:
+                yield "attachment", self._attachment_data(att)
+
+            if len(attachments) < chunk_size:
+                break
+            after_id = attachments[-1].id
+
+        yield "watermark", watermark
+
+    def reconcile_by_email(
+        self, db: Session, *, email: str, client_hashes: Dict[str, str]
+    ) -> Dict:
+        """
+        Hash reconciliation sync: compare the client's appkey -> hash map with
+        the server content and return only new/changed headers plus the
+        appkeys the client should delete
+        """
+        headers, items, attachments, visits = self._fetch_sr_rows(db, email)
+        return self._build_reconcile_data(
+            email, client_hashes, headers, items, attachments, visits
         )
 
-        if not headers:
-            return {
-                "user": UserData(email=email, code="", user_role="unknown"),
-                "header": [],
-                "attachments": [],
-            }
+    def get_sr_delta_by_email(
+        self, db: Session, *, email: str, updated_since: datetime
+    ) -> Dict:
+        """
+        Incremental sync: only headers (with all their items) and attachments
+        changed at or after updated_since, deactivated attachments as tombstones
+        and the new watermark for the next call. Rows stamped exactly at the
+        watermark come back on the next call, clients upsert by appkey
+        """
+        updated_since = self._normalize_since(updated_since)
 
-        # Get the first header to determine user info
-        first_header = headers[0]
-        user_role = self._get_user_role(email, first_header)
+        user_row = db.execute(self._user_stmt(email)).first()
+        if user_row is None:
+            return self._empty_sr_data(email, updated_since)
 
-        # Get all keyids from headers
+        headers = db.execute(self._delta_headers_stmt(email, updated_since)).all()
         keyids = [header.keyid for header in headers]
 
-        # Get items for all headers using keyid relationship
-        items = db.query(SrFctItems).filter(SrFctItems.keyid.in_(keyids)).all()
+        items = db.execute(self._items_stmt(keyids)).all() if keyids else []
+        visits = db.execute(self._visits_stmt(keyids)).all() if keyids else []
+        attachments = db.execute(
+            self._delta_attachments_stmt(email, updated_since)
+        ).all()
 
-        # Get attachments for all headers using keyid relationship
-        attachments = (
-            db.query(SrFctAttachment).filter(SrFctAttachment.keyid.in_(keyids)).all()
+        return self._build_sr_data(
+            email,
+            headers,
+            items,
+            attachments,
+            visits,
+            user_row=user_row,
+            updated_since=updated_since,
         )
 
-        # Get visit data for customer info
-        # keyid in sr_fct_header references appkey in fct_visits
-        visit_keyids = [header.keyid for header in headers]
-        visits = db.query(FctVisits).filter(FctVisits.appkey.in_(visit_keyids)).all()
+    def _build_sr_data(
+        self,
+        email: str,
+        headers: Sequence[Row],
+        items: Sequence[Row],
+        attachments: Sequence[Row],
+        visits: Sequence[Row],
+        *,
+        user_row: Optional[Row] = None,
+        updated_since: Optional[datetime] = None,
+    ) -> Dict:
+        """Structure the fetched rows into the sync payload"""
+
+        # Get the first header to determine user info
+        first_header = user_row if user_row is not None else headers[0]
+        user_role = self._get_user_role(email, first_header)
+
+        # In delta mode deactivated attachments are sent as tombstones
+        deleted_attachments = []
+        if updated_since is not None:
+            deleted_attachments = [
+                att.appkey for att in attachments if self._is_deactivated(att)
+            ]
+            active_attachments = [
+                att for att in attachments if not self._is_deactivated(att)
+            ]
+        else:
+            active_attachments = attachments
 
         # Create a mapping of visit appkey to visit data
         visit_map = {visit.appkey: visit for visit in visits}
 
+        # Bucket items and attachments once instead of scanning per header
+        items_by_key, attachments_by_keyid = self._group_by_keyid(
+            items, active_attachments
+        )
+
         # Structure the response
-        structured_headers = []
+        structured_headers = [
+            self._header_data(header, visit_map.get(header.keyid), items_by_key)
+            for header in headers
+        ]
 
-        for header in headers:
-            # Get visit data for this header
-            visit = visit_map.get(header.keyid)
+        return {
+            "user": UserData(email=email, code=first_header.code, user_role=user_role),
+            "header": structured_headers,
+            "attachments": [
+                self._attachment_data(att)
+                for keyid_attachments in attachments_by_keyid.values()
+                for att in keyid_attachments
+            ],
+            "deleted_attachments": deleted_attachments,
+            "watermark": self._watermark(updated_since, headers, items, attachments),
+        }
 
-            # Get items for this header
-            header_items = [item for item in items if item.keyid == header.keyid]
+    def _build_reconcile_data(
+        self,
+        email: str,
+        client_hashes: Dict[str, str],
+        headers: Sequence[Row],
+        items: Sequence[Row],
+        attachments: Sequence[Row],
+        visits: Sequence[Row],
+    ) -> Dict:
+        """Diff the server headers against the client's appkey -> hash map"""
+        if not headers:
+            return {
+                "user": UserData(email=email, code="", user_role="unknown"),
+                "header": [],
+                "attachments": [],
+                "hashes": {},
+                "deleted_headers": list(client_hashes),
+            }
 
-            # Separate return and replace items based on fk_actiontype
-            return_items = [
-                SrSyncItemData.from_sr_item(item)
-                for item in header_items
-                if item.fk_actiontype == 251
-            ]
+        first_header = headers[0]
+        user_role = self._get_user_role(email, first_header)
 
-            replace_items = [
-                SrSyncItemData.from_sr_item(item)
-                for item in header_items
-                if item.fk_actiontype == 252
-            ]
+        visit_map = {visit.appkey: visit for visit in visits}
+        items_by_key, attachments_by_keyid = self._group_by_keyid(items, attachments)
 
-            # Create header data
-            header_data = SrSyncHeaderData(
-                appkey=header.appkey,
-                keyid=header.keyid,
-                fk_typerequest=header.fk_typerequest,
-                fk_reasonreturn=header.fk_reasonreturn,
-                fk_modereturn=header.fk_modereturn,
-                fk_status=header.fk_status,
-                fk_srrtype=header.fk_srrtype,
-                code=header.code,
-                created_at=(
-                    header.created_at.isoformat() if header.created_at else None
-                ),
-                # Map FctVisits fields correctly: kunnr->customer_code, name->customer_name, address->customer_address
-                customer_code=visit.kunnr if visit else "",
-                customer_name=visit.name if visit else "",
-                customer_address=visit.address if visit else "",
-                ship_name=(
-                    visit.name if visit else ""
-                ),  # Same as customer_name from visits
-                ship_to=(
-                    visit.kunnr if visit else ""
-                ),  # Same as customer_code from visits
-                updated_shiptocode=header.updated_shiptocode,
-                sdo_pao_remarks=header.sdo_pao_remarks,
-                ssa_remarks=header.ssa_remarks,
-                approver_remarks=header.approver_remarks,
-                remarks_return=header.remarks_return,
-                return_items=return_items,
-                replace_items=replace_items,
+        changed_headers = []
+        hashes = {}
+        for header in headers:
+            visit = visit_map.get(header.keyid)
+            digest, header_data = self._header_hash(
+                header, visit, items_by_key, attachments_by_keyid.get(header.keyid, ())
             )
+            if client_hashes.get(header.appkey) == digest:
+                continue
+            if header_data is None:
+                header_data = self._header_data(header, visit, items_by_key)
+            changed_headers.append(header_data)
+            hashes[header.appkey] = digest
 
-            structured_headers.append(header_data)
+        server_appkeys = {header.appkey for header in headers}
+        changed_keyids = dict.fromkeys(header["keyid"] for header in changed_headers)
 
         return {
             "user": UserData(email=email, code=first_header.code, user_role=user_role),
-            "header": structured_headers,
+            "header": changed_headers,
             "attachments": [
-                {
-                    "appkey": att.appkey,
-                    "keyid": att.keyid,
-                    "file_name": att.file_name
-                    or att.image,  # Use file_name or fallback to image
-                    "file_path": att.file_path or "",
-                    "file_size": getattr(
-                        att, "file_size", None
-                    ),  # May not exist in current model
-                    "file_type": getattr(
-                        att, "file_type", None
-                    ),  # May not exist in current model
-                    "uploaded_at": (
-                        att.created_at.isoformat() if att.created_at else None
-                    ),
-                }
-                for att in attachments
+                self._attachment_data(att)
+                for keyid in changed_keyids
+                for att in attachments_by_keyid.get(keyid, ())
+            ],
+            "hashes": hashes,
+            "deleted_headers": [
+                appkey for appkey in client_hashes if appkey not in server_appkeys
             ],
         }
 
 
+class AsyncCRUDSrSync(CRUDSrSync):
+    """Same sync payload, fetched through an AsyncSession (DB_ASYNC=true)"""
+
+    async def _fetch_sr_rows(
+        self, db: AsyncSession, email: str
+    ) -> Tuple[Sequence[Row], ...]:
+        headers = (await db.execute(self._headers_stmt(email))).all()
+
+        if not headers:
+            return headers, [], [], []
+
+        keyids = [header.keyid for header in headers]
+
+        items = (await db.execute(self._items_stmt(keyids))).all()
+        attachments = (await db.execute(self._attachments_stmt(keyids))).all()
+        visits = (await db.execute(self._visits_stmt(keyids))).all()
+
+        return headers, items, attachments, visits
+
+    async def get_sr_data_by_email(self, db: AsyncSession, *, email: str) -> Dict:
+        """Get all SR data structured according to the required JSON format"""
+        headers, items, attachments, visits = await self._fetch_sr_rows(db, email)
+
+        if not headers:
+            return self._empty_sr_data(email)
+
+        return self._build_sr_data(email, headers, items, attachments, visits)
+
+    async def get_sr_data_by_emails(
+        self, db: AsyncSession, *, emails: List[str]
+    ) -> Dict[str, Dict]:
+        """Batch full sync, see CRUDSrSync.get_sr_data_by_emails"""
+        headers = (await db.execute(self._batch_headers_stmt(emails))).all()
+        keyids = list(dict.fromkeys(header.keyid for header in headers))
+        if not keyids:
+            return self._build_batch_data(emails, headers, [], [], [])
+
+        items = (await db.execute(self._items_stmt(keyids))).all()
+        attachments = (await db.execute(self._attachments_stmt(keyids))).all()
+        visits = (await db.execute(self._visits_stmt(keyids))).all()
+        return self._build_batch_data(emails, headers, items, attachments, visits)
+
+    async def get_user_by_email(
+        self, db: AsyncSession, *, email: str
+    ) -> Optional[UserData]:
+        """User info from the first matching header, None if the email has no SR data"""
+        user_row = (await db.execute(self._user_stmt(email))).first()
+        return self._user_data(email, user_row) if user_row is not None else None
+
+    async def iter_sr_data_by_email(
+        self, db: AsyncSession, *, email: str, chunk_size: int
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Chunked full sync for streaming, see CRUDSrSync.iter_sr_data_by_email"""
+        watermark = None
+
+        after_id = 0
+        while True:
+            headers = (
+                await db.execute(self._header_chunk_stmt(email, after_id, chunk_size))
+            ).all()
+            if not headers:
+                break
+            keyids = list(dict.fromkeys(header.keyid for header in headers))
+            items = (await db.execute(self._items_stmt(keyids))).all()
+            visits = (await db.execute(self._visits_stmt(keyids))).all()
+
+            watermark = self._watermark(watermark, headers, items)
+            for header_data in self._header_chunk_data(headers, items, visits):
+                yield "header", header_data
+
+            if len(headers) < chunk_size:
+                break
+            after_id = headers[-1].id
+
+        after_id = 0
+        while True:
+            attachments = (
+                await db.execute(
+                    self._attachment_chunk_stmt(email, after_id, chunk_size)
+                )
+            ).all()
+            if not attachments:
+                break
+            watermark = self._watermark(watermark, attachments)
+            for att in attachments:
+                yield "attachment", self._attachment_data(att)
+
+            if len(attachments) < chunk_size:
+                break
+            after_id = attachments[-1].id
+
+        yield "watermark", watermark
+
+    async def reconcile_by_email(
+        self, db: AsyncSession, *, email: str, client_hashes: Dict[str, str]
+    ) -> Dict:
+        """Hash reconciliation sync, see CRUDSrSync.reconcile_by_email"""
+        headers, items, attachments, visits = await self._fetch_sr_rows(db, email)
+        return self._build_reconcile_data(
+            email, client_hashes, headers, items, attachments, visits
+        )
+
+    async def get_sr_delta_by_email(
+        self, db: AsyncSession, *, email: str, updated_since: datetime
+    ) -> Dict:
+        """Incremental sync, see CRUDSrSync.get_sr_delta_by_email"""
+        updated_since = self._normalize_since(updated_since)
+
+        user_row = (await db.execute(self._user_stmt(email))).first()
+        if user_row is None:
+            return self._empty_sr_data(email, updated_since)
+
+        headers = (
+            await db.execute(self._delta_headers_stmt(email, updated_since))
+        ).all()
+        keyids = [header.keyid for header in headers]
+
+        items = (await db.execute(self._items_stmt(keyids))).all() if keyids else []
+        visits = (await db.execute(self._visits_stmt(keyids))).all() if keyids else []
+        attachments = (
+            await db.execute(self._delta_attachments_stmt(email, updated_since))
+        ).all()
+
+        return self._build_sr_data(
+            email,
+            headers,
+            items,
+            attachments,
+            visits,
+            user_row=user_row,
+            updated_since=updated_since,
+        )
+
+
 sr_sync_crud = CRUDSrSync()
+async_sr_sync_crud = AsyncCRUDSrSync()
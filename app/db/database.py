@@ -1,68 +1,214 @@
 # app/db/database.py
-from sqlalchemy import create_engine, event, inspect
+from sqlalchemy import create_engine, event, inspect, select
+from sqlalchemy.engine import URL, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, StaticPool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from fastapi.concurrency import run_in_threadpool
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import logging
+import time
 
 from app.core.config import get_settings
+from app.core.metrics import (
+    registry,
+    db_pool_checked_out,
+    db_pool_checkout_seconds,
+    db_pool_invalidations_total,
+    db_pool_overflow,
+    db_pool_overflow_connections_total,
+    db_pool_pre_ping_failures_total,
+    db_pool_size,
+    db_pool_timeouts_total,
+)
+from app.db.lazy_loads import set_lazy_load_policy
+from app.db.query_stats import current_query_stats
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
-# Create engine with environment-specific settings
-engine_kwargs = {
-    "pool_pre_ping": True,
-    "pool_recycle": 3600,
-    "echo": settings.database_echo,
-    "connect_args": {
-        "connect_timeout": 60,
-        "read_timeout": 60,
-        "write_timeout": 60,
-        "charset": "utf8mb4",
-    },
-}
-
-# Production/Staging-specific optimizations
-if settings.is_production() or settings.is_staging():
-    engine_kwargs.update(
-        {
-            "poolclass": QueuePool,
-            "pool_size": 10,
-            "max_overflow": 20,
-            "pool_timeout": 30,
-            "pool_recycle": 1800,
-        }
+
+class _TimedCheckoutMixin:
+    """Records how long each checkout took, timeouts and overflow connections"""
+
+    metrics_label = "sync"
+
+    def _do_get(self):
+        start_time = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            db_pool_timeouts_total.inc((self.metrics_label,))
+            raise
+        finally:
+            db_pool_checkout_seconds.observe(
+                time.perf_counter() - start_time, (self.metrics_label,)
+            )
+
+    def _create_connection(self):
+        # Only called for new pool entries; overflow is already counted up
+        if self.overflow() > 0:
+            db_pool_overflow_connections_total.inc((self.metrics_label,))
+        return super()._create_connection()
+
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+def _pool_options(is_async: bool = False) -> dict:
+    """QueuePool sizing by environment"""
+    options = {"poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool}
+    # Production/Staging-specific optimizations
+    if settings.is_production() or settings.is_staging():
+        options.update(
+            {
+                "pool_size": 10,
+                "max_overflow": 20,
+                "pool_timeout": 30,
+                "pool_recycle": 1800,
+            }
+        )
+    else:
+        # Development settings
+        options.update({"pool_size": 5, "max_overflow": 10, "pool_timeout": 10})
+    return options
+
+
+def is_sqlite_memory(url: URL) -> bool:
+    """sqlite://, sqlite:///:memory: or a file:...?mode=memory URI"""
+    database = url.database or ""
+    return (
+        database in ("", ":memory:")
+        or url.query.get("mode") == "memory"
+        or "mode=memory" in database
     )
-else:
-    # Development settings
-    engine_kwargs.update(
-        {
-            "pool_size": 5,
-            "max_overflow": 10,
-            "pool_timeout": 10,
+
+
+def engine_options(url: URL, is_async: bool = False) -> dict:
+    """create_engine keyword arguments for the URL's dialect and driver"""
+    options = {
+        "pool_pre_ping": True,
+        "pool_recycle": 3600,
+        "echo": settings.database_echo,
+    }
+    backend = url.get_backend_name()
+
+    if backend == "sqlite":
+        # Sessions are used from threadpool workers
+        options["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT,
         }
-    )
+        if is_sqlite_memory(url):
+            # Every new connection would open its own empty database, share one
+            options["poolclass"] = StaticPool
+        else:
+            options.update(_pool_options(is_async))
+        return options
+
+    options.update(_pool_options(is_async))
+    if backend in ("mysql", "mariadb"):
+        options["connect_args"] = {"connect_timeout": 60, "charset": "utf8mb4"}
+        # aiomysql does not support read_timeout/write_timeout
+        if not is_async:
+            options["connect_args"].update({"read_timeout": 60, "write_timeout": 60})
+    return options
+
 
-engine = create_engine(settings.DATABASE_URL, **engine_kwargs)
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Start timing the statement when a request is collecting query stats"""
+    if current_query_stats() is not None:
+        context._query_start_time = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Attribute the statement's time and rowcount to the current request"""
+    stats = current_query_stats()
+    start_time = getattr(context, "_query_start_time", None)
+    if stats is not None and start_time is not None:
+        stats.record(time.perf_counter() - start_time, cursor.rowcount, statement)
+
+
+def instrument_engine(sync_engine):
+    """Per-request query count, DB time and rows (see app/db/query_stats.py)"""
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", after_cursor_execute)
 
 
-# Add connection event listeners for logging
-@event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
-    """Configure database connection settings"""
+    """WAL and synchronous mode for every new SQLite connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    finally:
+        cursor.close()
+
+
+def log_connect(dbapi_connection, connection_record):
+    """Log new connections outside production"""
     if not settings.is_production():
         logger.debug("Database connection established")
 
 
-@event.listens_for(engine, "checkout")
 def receive_checkout(dbapi_connection, connection_record, connection_proxy):
     """Log connection checkout in development"""
     if settings.is_development():
         logger.debug("Connection checked out from pool")
 
 
+def instrument_pool(sync_engine, label: str):
+    """Invalidation and pre-ping failure counters for /metrics"""
+
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        db_pool_invalidations_total.inc((label, "hard"))
+
+    def on_soft_invalidate(dbapi_connection, connection_record, exception):
+        db_pool_invalidations_total.inc((label, "soft"))
+
+    def on_handle_error(context):
+        if context.is_pre_ping:
+            db_pool_pre_ping_failures_total.inc((label,))
+
+    event.listen(sync_engine, "invalidate", on_invalidate)
+    event.listen(sync_engine, "soft_invalidate", on_soft_invalidate)
+    event.listen(sync_engine, "handle_error", on_handle_error)
+
+
+def create_database_engine(url):
+    """Sync engine for DATABASE_URL (or a benchmark/test database)"""
+    url = make_url(url)
+    new_engine = create_engine(url, **engine_options(url))
+    if url.get_backend_name() == "sqlite":
+        event.listen(new_engine, "connect", set_sqlite_pragma)
+    event.listen(new_engine, "connect", log_connect)
+    event.listen(new_engine, "checkout", receive_checkout)
+    instrument_engine(new_engine)
+    instrument_pool(new_engine, TimedQueuePool.metrics_label)
+    return new_engine
+
+
+def create_async_database_engine(url):
+    """Async engine for the DB_ASYNC routes, events go through its sync_engine"""
+    url = make_url(url)
+    new_engine = create_async_engine(url, **engine_options(url, is_async=True))
+    if url.get_backend_name() == "sqlite":
+        event.listen(new_engine.sync_engine, "connect", set_sqlite_pragma)
+    instrument_engine(new_engine.sync_engine)
+    instrument_pool(new_engine.sync_engine, TimedAsyncAdaptedQueuePool.metrics_label)
+    return new_engine
+
+
+engine = create_database_engine(settings.DATABASE_URL)
+
 # Create session factory
 SessionLocal = sessionmaker(
     autocommit=False,
@@ -71,6 +217,151 @@ SessionLocal = sessionmaker(
     expire_on_commit=False,  # Prevent lazy loading issues
 )
 
+# Development/tests: report relationship lazy loads (N+1 queries)
+set_lazy_load_policy(settings.LAZY_LOAD_POLICY)
+
+# Async engine/session factory (only when DB_ASYNC is enabled)
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.DB_ASYNC:
+    async_engine = create_async_database_engine(settings.async_database_url)
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+def collect_pool_metrics():
+    """Pool gauges for /metrics, read when a snapshot is taken"""
+    engines = [("sync", engine)]
+    if async_engine is not None:
+        engines.append(("async", async_engine))
+    for label, pool_engine in engines:
+        pool = pool_engine.pool
+        if not isinstance(pool, QueuePool):
+            continue
+        db_pool_size.set(pool.size(), (label,))
+        db_pool_checked_out.set(pool.checkedout(), (label,))
+        db_pool_overflow.set(max(pool.overflow(), 0), (label,))
+
+
+registry.add_collector(collect_pool_metrics)
+
+
+def _warm_up_count(pool_engine, count: int) -> int:
+    pool = pool_engine.pool
+    # Connections beyond pool_size would be closed again on checkin
+    return min(count, pool.size()) if isinstance(pool, QueuePool) else min(count, 1)
+
+
+def _warm_up_sync_pool(count: int) -> int:
+    # pool_size 0 leaves nothing to keep (and ThreadPoolExecutor needs a worker)
+    if count <= 0:
+        return 0
+
+    def open_connection():
+        connection = engine.connect()
+        try:
+            connection.execute(select(1))
+        except Exception:
+            connection.close()
+            raise
+        return connection
+
+    # Hold every connection until all are open so each one is a new pool entry
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        futures = [executor.submit(open_connection) for _ in range(count)]
+    connections = []
+    for future in futures:
+        try:
+            connections.append(future.result())
+        except Exception as e:
+            logger.warning(f"Pool warm-up connection failed: {e}")
+    for connection in connections:
+        connection.close()
+    return len(connections)
+
+
+async def _warm_up_async_pool(count: int) -> int:
+    if count <= 0:
+        return 0
+
+    async def open_connection():
+        connection = await async_engine.connect()
+        try:
+            await connection.execute(select(1))
+        except Exception:
+            await connection.close()
+            raise
+        return connection
+
+    results = await asyncio.gather(
+        *(open_connection() for _ in range(count)), return_exceptions=True
+    )
+    opened = 0
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning(f"Pool warm-up connection failed: {result}")
+            continue
+        await result.close()
+        opened += 1
+    return opened
+
+
+async def warm_up_pools(count: int):
+    """
+    Open up to count connections per engine at once and validate each with
+    SELECT 1, so the first requests after a deploy skip connect and auth
+    """
+    targets = [("sync", engine)]
+    if async_engine is not None:
+        targets.append(("async", async_engine))
+    for label, pool_engine in targets:
+        target = _warm_up_count(pool_engine, count)
+        start_time = time.perf_counter()
+        if label == "sync":
+            opened = await run_in_threadpool(_warm_up_sync_pool, target)
+        else:
+            opened = await _warm_up_async_pool(target)
+        logger.info(
+            f"Pool warm-up ({label}): {opened}/{target} connections in "
+            f"{(time.perf_counter() - start_time) * 1000:.0f} ms"
+        )
+
+
+def pool_statistics():
+    """Current pool state plus the event counters, per engine"""
+    collect_pool_metrics()
+    stats = {}
+    for metric in (
+        db_pool_size,
+        db_pool_checked_out,
+        db_pool_overflow,
+        db_pool_overflow_connections_total,
+        db_pool_timeouts_total,
+        db_pool_pre_ping_failures_total,
+    ):
+        # str.removeprefix needs Python 3.9, the declared target is 3.8
+        name = metric.name
+        key = name[len("db_pool_") :] if name.startswith("db_pool_") else name
+        for labels, value in metric.samples():
+            stats.setdefault(labels[0], {})[key] = value
+    for labels, value in db_pool_invalidations_total.samples():
+        stats.setdefault(labels[0], {})[f"invalidations_{labels[1]}_total"] = value
+    for labels, (bucket_counts, total) in db_pool_checkout_seconds.samples():
+        checkouts = sum(bucket_counts)
+        stats.setdefault(labels[0], {}).update(
+            {
+                "checkouts": checkouts,
+                "checkout_wait_avg_ms": total / checkouts * 1000 if checkouts else 0.0,
+            }
+        )
+    return stats
+
+
 # Create declarative base
 Base = declarative_base()
 
@@ -89,6 +380,26 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Async database session dependency (DB_ASYNC=true)"""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database is disabled, set DB_ASYNC=true")
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Async database session error: {e}")
+            await db.rollback()
+            raise
+
+
+async def dispose_engines():
+    """Release pooled connections on shutdown"""
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+
+
 # Database utilities
 def test_database_connection():
     """Test database connectivity"""
@@ -103,58 +414,48 @@ def test_database_connection():
 
 
 # Health check function
-async def get_database_status():
-    """Get database status for health checks"""
-    try:
-        with engine.connect():
-            return (
-                {
-                    "status": "healthy",
-                    "connection_pool_size": engine.pool.size(),
-                    "checked_out_connections": engine.pool.checkedout(),
-                }
-                if not settings.is_production()
-                else {"status": "healthy"}
-            )
-    except Exception as e:
-        logger.error(f"Database health check failed: {e}")
+def _database_status():
+    with engine.connect():
+        if settings.is_production() or not isinstance(engine.pool, QueuePool):
+            return {"status": "healthy"}
         return {
-            "status": "unhealthy",
-            "error": str(e) if not settings.is_production() else "Database error",
+            "status": "healthy",
+            "connection_pool_size": engine.pool.size(),
+            "checked_out_connections": engine.pool.checkedout(),
         }
 
 
-def verify_tables_with_retry(engine, base, max_retries=3, logger=logger):
-    """Verify tables with retry logic for Railway deployment"""
-    for attempt in range(max_retries):
-        try:
-            inspector = inspect(engine)
-            existing_tables = inspector.get_table_names()
-            missing_tables = []
-
-            for table in base.metadata.tables.keys():
-                if table not in existing_tables:
-                    missing_tables.append(table)
-
-            if missing_tables:
-                logger.warning(f"Missing tables detected: {missing_tables}")
-            else:
-                logger.info("All ORM tables verified successfully")
-            return True
-
-        except OperationalError as e:
-            logger.warning(f"Database verification attempt {attempt + 1} failed: {e}")
-            if attempt < max_retries - 1:
-                import time
-
-                time.sleep(5 * (attempt + 1))  # Exponential backoff
-            else:
-                logger.error(
-                    f"Database verification failed after {max_retries} attempts"
-                )
-                raise e
+async def get_database_status():
+    """Get database status for health checks, the connect runs off the event loop"""
+    try:
+        return await asyncio.wait_for(
+            run_in_threadpool(_database_status), settings.READY_DB_TIMEOUT_SECONDS
+        )
+    except asyncio.TimeoutError:
+        error = f"No answer within {settings.READY_DB_TIMEOUT_SECONDS}s"
+    except Exception as e:
+        error = str(e)
+    logger.error(f"Database health check failed: {error}")
+    return {
+        "status": "unhealthy",
+        "error": error if not settings.is_production() else "Database error",
+    }
 
 
-# Update your verify_tables function
 def verify_tables(engine, base, logger=logger):
-    return verify_tables_with_retry(engine, base, logger=logger)
+    """
+    Missing ORM tables, checked one by one so only our tables are looked up
+    Raises on connection errors; retries are left to the caller
+    (app/core/readiness.py) so nothing sleeps here
+    """
+    with engine.connect() as connection:
+        inspector = inspect(connection)
+        missing_tables = [
+            table for table in base.metadata.tables if not inspector.has_table(table)
+        ]
+
+    if missing_tables:
+        logger.warning(f"Missing tables detected: {missing_tables}")
+    else:
+        logger.info("All ORM tables verified successfully")
+    return missing_tables
@@ -0,0 +1,74 @@
+# app/db/lazy_loads.py
+"""
+Lazy-load detector for development and tests
+
+With LAZY_LOAD_POLICY=warn every relationship lazy load (SrFctHeader.items,
+.attachments, .customer, the DimCustomDropdown back-refs, ...) is logged
+with its SQL and the application frames that touched the attribute; with
+raise it fails with LazyLoadError instead. Loads through selectinload /
+joinedload are not affected, only the per-instance lazy ones that turn a
+list endpoint into N+1 queries
+"""
+
+import logging
+import os
+import traceback
+from typing import List
+
+import sqlalchemy
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+logger = logging.getLogger(__name__)
+
+LAZY_LOAD_POLICIES = ("off", "warn", "raise")
+
+# SQLAlchemy's own frames are left out of the report
+SQLALCHEMY_ROOT = os.path.dirname(sqlalchemy.__file__)
+
+_policy = "off"
+
+
+class LazyLoadError(RuntimeError):
+    """A relationship was lazy loaded while LAZY_LOAD_POLICY=raise"""
+
+
+def _app_stack() -> List[str]:
+    frames = [
+        frame
+        for frame in traceback.extract_stack()
+        if not frame.filename.startswith(SQLALCHEMY_ROOT) and frame.filename != __file__
+    ]
+    return traceback.format_list(frames[-8:])
+
+
+def _on_orm_execute(state: ORMExecuteState):
+    parent = state.lazy_loaded_from
+    if parent is None:
+        return
+    path = state.loader_strategy_path
+    attribute = f"{parent.class_.__name__}.{path[-1].key}" if path else "?"
+    message = (
+        f"Lazy load of {attribute}\n"
+        f"SQL: {state.statement}\n"
+        f"Triggered from:\n{''.join(_app_stack())}"
+    )
+    if _policy == "raise":
+        raise LazyLoadError(message)
+    logger.warning(message)
+
+
+def set_lazy_load_policy(policy: str) -> str:
+    """Switch the detector, returns the previous policy"""
+    global _policy
+    policy = policy.lower()
+    if policy not in LAZY_LOAD_POLICIES:
+        raise ValueError(f"Unknown LAZY_LOAD_POLICY: {policy}")
+    previous = _policy
+    listening = event.contains(Session, "do_orm_execute", _on_orm_execute)
+    if policy == "off" and listening:
+        event.remove(Session, "do_orm_execute", _on_orm_execute)
+    elif policy != "off" and not listening:
+        event.listen(Session, "do_orm_execute", _on_orm_execute)
+    _policy = policy
+    return previous
@@ -0,0 +1,159 @@
+# app/db/query_plans.py
+"""
+EXPLAIN the hot CRUD queries and report full table scans
+
+    python -m app.db.query_plans            # exit status 1 when a scan is found
+                                            # (2 when the database is unreachable)
+    python -m app.db.query_plans --verbose  # print every plan row
+
+Also run from the lifespan when EXPLAIN_CHECK_ON_STARTUP is enabled
+"""
+
+import argparse
+import logging
+import re
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.engine import Connection, Engine
+
+from app.crud.sr_attachment import sr_attachment_crud
+from app.crud.sr_freshness import sr_freshness_crud
+from app.crud.sr_header import sr_header_crud
+from app.crud.sr_items import sr_items_crud
+from app.crud.sr_sync import sr_sync_crud
+from app.models import FctVisits, SrFctLogsRemarksHeader, SrFctLogsRemarksItems
+
+logger = logging.getLogger(__name__)
+
+# Placeholder values; plans depend on the predicates, not on what matches
+SAMPLE_EMAIL = "explain@example.com"
+SAMPLE_KEYIDS = ["EXPLAIN-1", "EXPLAIN-2"]
+SAMPLE_SINCE = datetime(2000, 1, 1)
+
+# SQLite: "SCAN sr_fct_items" is a full scan, "SCAN t USING [COVERING] INDEX ix"
+# walks an index and "SEARCH ..." is an index lookup
+SQLITE_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)$")
+
+
+class FullScan(NamedTuple):
+    query: str
+    table: str
+    detail: str
+
+
+def hot_queries() -> Dict[str, Any]:
+    """The statements behind the email and keyid endpoints, keyed by a short name"""
+    return {
+        "sync.headers": sr_sync_crud._headers_stmt(SAMPLE_EMAIL),
+        "sync.user": sr_sync_crud._user_stmt(SAMPLE_EMAIL),
+        "sync.items": sr_sync_crud._items_stmt(SAMPLE_KEYIDS),
+        "sync.attachments": sr_sync_crud._attachments_stmt(SAMPLE_KEYIDS),
+        "sync.visits": sr_sync_crud._visits_stmt(SAMPLE_KEYIDS),
+        "sync.batch_headers": sr_sync_crud._batch_headers_stmt([SAMPLE_EMAIL]),
+        "sync.header_chunk": sr_sync_crud._header_chunk_stmt(SAMPLE_EMAIL, 0, 500),
+        "sync.attachment_chunk": sr_sync_crud._attachment_chunk_stmt(
+            SAMPLE_EMAIL, 0, 500
+        ),
+        "sync.delta_headers": sr_sync_crud._delta_headers_stmt(
+            SAMPLE_EMAIL, SAMPLE_SINCE
+        ),
+        "sync.delta_attachments": sr_sync_crud._delta_attachments_stmt(
+            SAMPLE_EMAIL, SAMPLE_SINCE
+        ),
+        "freshness.probe": sr_freshness_crud._probe_stmt(SAMPLE_EMAIL),
+        "headers.page": sr_header_crud._page_stmt(SAMPLE_EMAIL, None, 100),
+        "items.page": sr_items_crud._page_stmt(SAMPLE_EMAIL, None, 100),
+        "attachments.page": sr_attachment_crud._page_stmt(SAMPLE_EMAIL, None, 100),
+        "visits.by_email": select(FctVisits).where(
+            (FctVisits.fspemail == SAMPLE_EMAIL) | (FctVisits.rsmemail == SAMPLE_EMAIL)
+        ),
+        "logs_header.by_keyids": select(SrFctLogsRemarksHeader).where(
+            SrFctLogsRemarksHeader.keyid.in_(SAMPLE_KEYIDS)
+        ),
+        "logs_items.by_keyids": select(SrFctLogsRemarksItems).where(
+            SrFctLogsRemarksItems.keyid.in_(SAMPLE_KEYIDS)
+        ),
+    }
+
+
+def _explain(connection: Connection, stmt) -> List[Dict[str, Any]]:
+    dialect = connection.dialect
+    sql = str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN " if dialect.name == "sqlite" else "EXPLAIN "
+    # Literal values contain no bind markers, escape the driver's % paramstyle
+    if dialect.paramstyle in ("format", "pyformat"):
+        sql = sql.replace("%", "%%")
+    result = connection.exec_driver_sql(prefix + sql)
+    return [dict(row._mapping) for row in result]
+
+
+def _full_scans(name: str, dialect: str, plan: Sequence[Dict]) -> List[FullScan]:
+    scans = []
+    for row in plan:
+        if dialect == "sqlite":
+            match = SQLITE_SCAN.match(row["detail"])
+            if match:
+                scans.append(FullScan(name, match.group(1), row["detail"]))
+        elif str(row.get("type") or "").upper() == "ALL":
+            # MySQL/MariaDB access type ALL reads every row of the table
+            scans.append(
+                FullScan(
+                    name,
+                    row.get("table") or "?",
+                    f"type=ALL rows={row.get('rows')} "
+                    f"possible_keys={row.get('possible_keys')}",
+                )
+            )
+    return scans
+
+
+def check_query_plans(engine: Engine, verbose: bool = False) -> List[FullScan]:
+    """EXPLAIN every hot query and log a warning for each full table scan"""
+    dialect = engine.dialect.name
+    if dialect not in ("mysql", "mariadb", "sqlite"):
+        logger.info(f"Query plan check skipped, unsupported dialect {dialect}")
+        return []
+
+    scans: List[FullScan] = []
+    with engine.connect() as connection:
+        for name, stmt in hot_queries().items():
+            try:
+                plan = _explain(connection, stmt)
+            except Exception as e:
+                logger.warning(f"EXPLAIN failed for {name}: {e}")
+                continue
+            if verbose:
+                for row in plan:
+                    logger.info(f"{name}: {row}")
+            scans.extend(_full_scans(name, dialect, plan))
+
+    for scan in scans:
+        logger.warning(
+            f"Full table scan in {scan.query} on {scan.table}: {scan.detail}"
+        )
+    if not scans:
+        logger.info(f"Query plan check: {len(hot_queries())} queries use indexes")
+    return scans
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--verbose", action="store_true", help="print every plan row")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    from app.db.database import engine
+
+    try:
+        scans = check_query_plans(engine, verbose=args.verbose)
+    except Exception as e:
+        logger.error(f"Query plan check failed: {e}")
+        return 2
+    return 1 if scans else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+# app/db/query_stats.py
+from contextvars import ContextVar, Token
+from typing import List, Optional, Tuple
+
+
+class QueryStats:
+    """
+    SQL executed on behalf of one request, filled in by the cursor execute
+    hooks in app/db/database.py. rows is the DB-API rowcount: rows fetched
+    for SELECTs on MySQL drivers, affected rows for writes (SQLite reports
+    nothing for SELECTs). Stats begun inside another one (a request made
+    from a test's query counter) also add to the outer one
+    """
+
+    __slots__ = ("count", "db_time", "rows", "statements", "parent")
+
+    def __init__(
+        self, parent: Optional["QueryStats"] = None, keep_statements: bool = False
+    ):
+        self.count = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.statements: Optional[List[str]] = [] if keep_statements else None
+        self.parent = parent
+
+    def record(self, elapsed: float, rowcount: int, statement: str):
+        self.count += 1
+        self.db_time += elapsed
+        if rowcount > 0:
+            self.rows += rowcount
+        if self.statements is not None:
+            self.statements.append(statement)
+        if self.parent is not None:
+            self.parent.record(elapsed, rowcount, statement)
+
+    def server_timing(self, total_time: float) -> str:
+        """Server-Timing value splitting the elapsed time into db and app"""
+        db_ms = self.db_time * 1000
+        app_ms = max(total_time * 1000 - db_ms, 0.0)
+        return (
+            f'db;dur={db_ms:.1f};desc="{self.count} queries, {self.rows} rows", '
+            f"app;dur={app_ms:.1f}"
+        )
+
+
+# Shared by reference with threadpool workers, which run in a copy of the context
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def begin_query_stats(keep_statements: bool = False) -> Tuple[QueryStats, Token]:
+    """Start attributing SQL in this context to a new QueryStats"""
+    stats = QueryStats(parent=_current.get(), keep_statements=keep_statements)
+    return stats, _current.set(stats)
+
+
+def end_query_stats(token: Token):
+    _current.reset(token)
@@ -1,16 +1,18 @@
 # app/main.py
 from fastapi import FastAPI, Request, HTTPException
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
+from fastapi.concurrency import run_in_threadpool
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from typing import Optional
 import logging
 
 from app.core.config import get_settings
 from app.core.logging import setup_logging, get_logger
 from app.api.v1.api import api_router
-from app.db.database import engine, verify_tables, get_database_status
-from app.models import Base
+from app.db.database import get_database_status, dispose_engines, pool_statistics
 
 from app.core.exceptions import (
     BaseCustomException,
@@ -19,7 +21,13 @@ from app.core.exceptions import (
     http_exception_handler_custom,
     generic_exception_handler,
 )
-from app.core.middleware import RequestIDMiddleware, LoggingMiddleware
+from app.core.middleware import RequestContextMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.responses import AppJSONResponse
+from app.core.cache import sync_response_cache
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, registry
+from app.core.readiness import startup_checks
+from app.services.dimension_cache import dimension_cache
 
 # Setup logging first
 setup_logging()
@@ -34,36 +42,24 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"Debug mode: {settings.debug_mode}")
     logger.info(f"Database echo: {settings.database_echo}")
+    logger.info(f"Async database: {settings.DB_ASYNC}")
     logger.info(f"CORS origins: {settings.cors_origins}")
 
-    # Test database connection with retries
-    max_retries = 5
-    for attempt in range(max_retries):
-        try:
-            logger.info(
-                f"Testing database connection (attempt {attempt + 1}/{max_retries})..."
-            )
-            verify_tables(engine, Base)
-            logger.info("Database connection and verification successful")
-            break
-        except Exception as e:
-            logger.error(f"Database verification failed (attempt {attempt + 1}): {e}")
-            if attempt < max_retries - 1:
-                import asyncio
-
-                await asyncio.sleep(5 * (attempt + 1))  # Exponential backoff
-            else:
-                logger.error("Max database connection retries exceeded")
-                # You can choose to either raise the exception or continue without DB
-                # For staging, you might want to continue and handle DB errors gracefully
-                if settings.is_staging():
-                    logger.warning("Continuing startup without database verification")
-                else:
-                    raise
+    # Table verification, EXPLAIN check and dimension cache load run in the
+    # background; /ready flips once they pass, /health answers right away
+    await startup_checks.start()
+
+    if settings.METRICS_ENABLED:
+        await registry.start()
 
     yield
 
     logger.info(f"Shutting down {settings.APP_NAME}")
+    await startup_checks.stop()
+    await dimension_cache.stop()
+    if settings.METRICS_ENABLED:
+        await registry.stop()
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -74,18 +70,20 @@ app = FastAPI(
     docs_url=settings.get_docs_url(),
     redoc_url=settings.get_redoc_url(),
     lifespan=lifespan,
+    default_response_class=AppJSONResponse,
 )
 
 # Middleware
-app.add_middleware(LoggingMiddleware)
-app.add_middleware(RequestIDMiddleware)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+app.add_middleware(RequestContextMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["X-Request-ID", "X-Process-Time"],
+    expose_headers=["X-Request-ID", "X-Process-Time", "Server-Timing", "ETag"],
 )
 
 # Exception handlers
@@ -113,20 +111,14 @@ async def root():
 
 @app.get("/health")
 async def health_check():
+    """Liveness: answers without touching the database"""
     response_data = {
         "status": "healthy",
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "version": settings.APP_VERSION,
+        "ready": startup_checks.ready,
     }
 
-    # Test database connection
-    try:
-        db_status = await get_database_status()
-        response_data["database"] = db_status
-    except Exception as e:
-        response_data["database"] = {"status": "unhealthy", "error": str(e)}
-        response_data["status"] = "degraded"
-
     if not settings.is_production():
         response_data["environment"] = settings.ENVIRONMENT
         response_data["debug_mode"] = settings.debug_mode
@@ -135,6 +127,30 @@ async def health_check():
     return response_data
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: 503 until the startup checks pass or while the database is down"""
+    response_data = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        **startup_checks.status(),
+    }
+    if startup_checks.ready:
+        response_data["database"] = await get_database_status()
+        response_data["ready"] = response_data["database"]["status"] == "healthy"
+    return AppJSONResponse(
+        response_data, status_code=200 if response_data["ready"] else 503
+    )
+
+
+if settings.METRICS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        # Reads the other workers' snapshot files when METRICS_MULTIPROC_DIR is set
+        body = await run_in_threadpool(registry.render)
+        return Response(body, media_type=METRICS_CONTENT_TYPE)
+
+
 if settings.is_development():
 
     @app.get("/debug/settings")
@@ -149,6 +165,31 @@ if settings.is_development():
             "show_docs": settings.show_docs,
         }
 
+    @app.get("/debug/cache")
+    async def debug_cache():
+        return (
+            sync_response_cache.stats() if sync_response_cache else {"enabled": False}
+        )
+
+    @app.get("/debug/pool")
+    async def debug_pool():
+        return pool_statistics()
+
+    @app.get("/debug/dimensions")
+    async def debug_dimensions():
+        return dimension_cache.stats()
+
+    @app.delete("/debug/cache")
+    async def debug_cache_invalidate(email: Optional[str] = None):
+        if sync_response_cache is None:
+            return {"enabled": False}
+        if email:
+            await sync_response_cache.invalidate(f"sr_sync:{email}")
+            await sync_response_cache.invalidate(f"sr_sync:{email}:enriched")
+        else:
+            await sync_response_cache.clear()
+        return sync_response_cache.stats()
+
     @app.get("/debug/exception")
     async def debug_exception():
         raise Exception("This is a test exception for debugging")
@@ -9,6 +9,7 @@ from sqlalchemy import (
     DECIMAL,
     ForeignKey,
     ForeignKeyConstraint,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -32,6 +33,8 @@ class FctVisits(Base):
         ForeignKeyConstraint(
             [kunnr, code], ["dim_customer.kunnr", "dim_customer.fspcode"]
         ),
+        Index("ix_fct_visits_fspemail", "fspemail"),
+        Index("ix_fct_visits_rsmemail", "rsmemail"),
     )
 
     vdate = Column(Date, nullable=False)
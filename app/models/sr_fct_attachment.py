@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
 
 class SrFctAttachment(Base):
     __tablename__ = "sr_fct_attachment"
+    __table_args__ = (
+        # keyid IN (...) lookups, also ordered by (created_at, id) for pagination
+        Index("ix_sr_fct_attachment_keyid_created_at_id", "keyid", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     appkey = Column(String(20))
@@ -6,6 +6,7 @@ from sqlalchemy import (
     DECIMAL,
     ForeignKey,
     ForeignKeyConstraint,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -35,6 +36,11 @@ class SrFctHeader(Base):
         ForeignKeyConstraint(
             [kunnr, code], ["dim_customer.kunnr", "dim_customer.fspcode"]
         ),
+        # Email filters resolve keyids from the index alone (sync, freshness)
+        Index("ix_sr_fct_header_fspemail_keyid", "fspemail", "keyid"),
+        Index("ix_sr_fct_header_rsmemail_keyid", "rsmemail", "keyid"),
+        Index("ix_sr_fct_header_keyid", "keyid"),
+        Index("ix_sr_fct_header_created_at_id", "created_at", "id"),
     )
 
     updated_shiptocode = Column(String(10))
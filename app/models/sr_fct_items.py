@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, DECIMAL, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, DECIMAL, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.models.base import Base
@@ -6,6 +6,13 @@ from app.models.base import Base
 
 class SrFctItems(Base):
     __tablename__ = "sr_fct_items"
+    __table_args__ = (
+        # keyid IN (...) lookups, also ordered by (created_at, id) for pagination
+        Index("ix_sr_fct_items_keyid_created_at_id", "keyid", "created_at", "id"),
+        # Delta sync: items changed since the watermark (OR of both timestamps)
+        Index("ix_sr_fct_items_updated_at", "updated_at"),
+        Index("ix_sr_fct_items_m_updated_at", "m_updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
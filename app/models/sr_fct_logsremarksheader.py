@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.models.base import Base
@@ -6,6 +6,7 @@ from app.models.base import Base
 
 class SrFctLogsRemarksHeader(Base):
     __tablename__ = "sr_fct_logsremarksheader"
+    __table_args__ = (Index("ix_sr_fct_logsremarksheader_keyid", "keyid"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     appkey = Column(String(50))
@@ -1,5 +1,5 @@
 # app/schemas/base.py - CLEANED VERSION
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
 from typing import Optional, Generic, TypeVar
 from datetime import datetime, timezone
 
@@ -28,5 +28,15 @@ class SuccessResponse(BaseModel, Generic[T]):
     )
     data: T = Field(description="Response data")
 
-    class Config:
-        json_encoders = {datetime: lambda v: v.isoformat()}
+    @field_serializer("timestamp", when_used="json")
+    def serialize_timestamp(self, value: datetime) -> str:
+        return value.isoformat()
+
+
+class PaginatedResponse(SuccessResponse[T], Generic[T]):
+    """Success response for a keyset-paginated list"""
+
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Pass as cursor to fetch the next page, null on the last page",
+    )
@@ -1,6 +1,6 @@
 # app/schemas/sr_sync.py
 from pydantic import BaseModel, Field
-from typing import List, Optional, Any
+from typing import Dict, List, Optional, Any
 from datetime import datetime
 from decimal import Decimal
 
@@ -13,6 +13,11 @@ class UserData(BaseModel):
     user_role: str  # "requestor", "validator", "approver", "unknown"
 
 
+class SrSyncLabel(BaseModel):
+    name: str
+    value: Optional[str] = None
+
+
 class SrSyncItemData(BaseModel):
     appkey: str
     keyid: str
@@ -31,10 +36,13 @@ class SrSyncItemData(BaseModel):
     code: str
     is_sdo: Optional[int] = None
     id: Optional[int] = None
+    # Only with enrich=true, from DimMara
+    maktx: Optional[str] = None
+    unit: Optional[str] = None
 
     @classmethod
     def from_sr_item(cls, item: SrFctItems) -> "SrSyncItemData":
-        """Convert SrFctItems model to SrSyncItemData"""
+        """Convert an SrFctItems entity or projected row to SrSyncItemData"""
         return cls(
             appkey=item.appkey,
             keyid=item.keyid,
@@ -55,6 +63,32 @@ class SrSyncItemData(BaseModel):
             id=item.id,
         )
 
+    @staticmethod
+    def payload_from_sr_item(item: SrFctItems) -> Dict[str, Any]:
+        """
+        Same shape as from_sr_item(item).model_dump() without validation,
+        for trusted DB rows on the sync fast path
+        """
+        return {
+            "appkey": item.appkey,
+            "keyid": item.keyid,
+            "matnr": item.matnr,
+            "fk_actiontype": item.fk_actiontype,
+            "discount": item.discount,
+            "qty": item.qty,
+            "srp": item.srp,
+            "total_amount": item.total_amount,
+            "net_price": item.net_price,
+            "net_total_amount": item.net_total_amount,
+            "fsp_remarks": item.fsp_remarks,
+            "ssa_remarks": item.ssa_remarks,
+            "dr_number": item.dr_number,
+            "dr_date": item.dr_date.isoformat() if item.dr_date else None,
+            "code": item.code,
+            "is_sdo": item.is_sdo,
+            "id": item.id,
+        }
+
 
 class SrSyncHeaderData(BaseModel):
     appkey: str
@@ -78,6 +112,12 @@ class SrSyncHeaderData(BaseModel):
     remarks_return: Optional[str] = None
     return_items: List[SrSyncItemData] = []
     replace_items: List[SrSyncItemData] = []
+    # Only with enrich=true, DimCustomDropdown labels of the fk_* ids
+    type_request: Optional[SrSyncLabel] = None
+    reason_return: Optional[SrSyncLabel] = None
+    mode_return: Optional[SrSyncLabel] = None
+    status: Optional[SrSyncLabel] = None
+    srr_type: Optional[SrSyncLabel] = None
 
 
 class SrSyncAttachmentData(BaseModel):
@@ -94,6 +134,49 @@ class SrSyncResponse(BaseModel):
     user: UserData
     header: List[SrSyncHeaderData]
     attachments: List[SrSyncAttachmentData]
+    deleted_attachments: List[str] = Field(
+        default=[], description="Appkeys of deactivated attachments (delta sync only)"
+    )
+    watermark: Optional[datetime] = Field(
+        default=None,
+        description=(
+            "Pass as updated_since on the next sync, rows stamped at the watermark "
+            "are sent again so upsert by appkey"
+        ),
+    )
 
     class Config:
         from_attributes = True
+
+
+class SrSyncBatchRequest(BaseModel):
+    emails: List[str] = Field(min_length=1, description="fspemail or rsmemail values")
+    enrich: bool = Field(
+        default=False, description="Add labels from the dimension cache"
+    )
+
+
+class SrSyncBatchResponse(BaseModel):
+    results: Dict[str, SrSyncResponse] = Field(
+        description="Full sync payload per email that has SR data"
+    )
+    not_found: List[str] = Field(description="Requested emails without SR data")
+
+
+class SrSyncReconcileRequest(BaseModel):
+    email: str
+    headers: Dict[str, str] = Field(
+        default={}, description="appkey -> content hash of the headers the client has"
+    )
+
+
+class SrSyncReconcileResponse(BaseModel):
+    user: UserData
+    header: List[SrSyncHeaderData] = Field(description="New or changed headers only")
+    attachments: List[SrSyncAttachmentData]
+    hashes: Dict[str, str] = Field(
+        description="appkey -> content hash for the returned headers"
+    )
+    deleted_headers: List[str] = Field(
+        description="Appkeys the client has that no longer exist on the server"
+    )
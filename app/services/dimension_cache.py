@@ -0,0 +1,205 @@
+# app/services/dimension_cache.py
+import asyncio
+import hashlib
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.crud.dimensions import dimensions_crud
+from app.db import database
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class DropdownLabel(NamedTuple):
+    id: int
+    name: str
+    value: Optional[str]
+    module: Optional[str]
+    active: Optional[str]
+
+
+class MaterialInfo(NamedTuple):
+    matnr: str
+    maktx: Optional[str]
+    unit: Optional[str]
+    matkl: Optional[str]
+
+
+class CustomerInfo(NamedTuple):
+    kunnr: str
+    fspcode: str
+    name: Optional[str]
+    address: Optional[str]
+    city: Optional[str]
+
+
+class DimensionSnapshot(NamedTuple):
+    """One immutable load of the dimension tables"""
+
+    version: str
+    loaded_at: datetime
+    probe: Tuple
+    dropdowns: Dict[int, DropdownLabel]
+    materials: Dict[str, MaterialInfo]
+    customers: Dict[Tuple[str, str], CustomerInfo]
+
+
+class DimensionCache:
+    """
+    Process-wide, read-mostly copy of DimCustomDropdown, DimMara and DimCustomer
+    Readers get dict lookups on the current snapshot; a refresh builds a new
+    snapshot and swaps the reference, so lookups never take a lock or hit SQL
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[DimensionSnapshot] = None
+        self._last_full_load = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot is not None
+
+    @property
+    def version(self) -> str:
+        """Content hash of the loaded rows, "" until the first load"""
+        return self._snapshot.version if self._snapshot else ""
+
+    # Lookups
+    def dropdown(self, id: Optional[int]) -> Optional[DropdownLabel]:
+        snapshot = self._snapshot
+        return snapshot.dropdowns.get(id) if snapshot and id is not None else None
+
+    def material(self, matnr: Optional[str]) -> Optional[MaterialInfo]:
+        snapshot = self._snapshot
+        return snapshot.materials.get(matnr) if snapshot and matnr else None
+
+    def customer(
+        self, kunnr: Optional[str], fspcode: Optional[str]
+    ) -> Optional[CustomerInfo]:
+        snapshot = self._snapshot
+        return snapshot.customers.get((kunnr, fspcode)) if snapshot else None
+
+    # Loading
+    def _content_version(self, *tables: Dict) -> str:
+        """
+        Same value in every process and after restarts for the same rows, so it
+        can go into ETags and response cache tags shared by several workers
+        """
+        digest = hashlib.blake2b(digest_size=8)
+        for table in tables:
+            for key in sorted(table):
+                digest.update(repr((key, tuple(table[key]))).encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def load(self, db: Session, probe: Optional[Tuple] = None) -> DimensionSnapshot:
+        """
+        Read the three tables and publish them under their content hash,
+        keeping the current dicts when the content did not change
+        """
+        start = time.perf_counter()
+        if probe is None:
+            probe = dimensions_crud.get_change_probe(db)
+        dropdowns = {
+            row.id: DropdownLabel(*row) for row in dimensions_crud.get_dropdowns(db)
+        }
+        materials = {
+            row.matnr: MaterialInfo(*row) for row in dimensions_crud.get_materials(db)
+        }
+        customers = {
+            (row.kunnr, row.fspcode): CustomerInfo(*row)
+            for row in dimensions_crud.get_customers(db)
+        }
+        version = self._content_version(dropdowns, materials, customers)
+        current = self._snapshot
+        unchanged = current is not None and current.version == version
+        snapshot = DimensionSnapshot(
+            version=version,
+            loaded_at=datetime.now(timezone.utc),
+            probe=probe,
+            dropdowns=current.dropdowns if unchanged else dropdowns,
+            materials=current.materials if unchanged else materials,
+            customers=current.customers if unchanged else customers,
+        )
+        self._snapshot = snapshot
+        self._last_full_load = time.monotonic()
+        logger.info(
+            f"Dimension cache v{snapshot.version} "
+            f"{'reloaded unchanged' if unchanged else 'loaded'}: "
+            f"{len(snapshot.dropdowns)} dropdowns, {len(snapshot.materials)} materials, "
+            f"{len(snapshot.customers)} customers in "
+            f"{(time.perf_counter() - start) * 1000:.0f} ms"
+        )
+        return snapshot
+
+    def refresh(self, db: Session) -> bool:
+        """
+        Reload if the change probe moved or the full reload interval passed
+        Returns whether a new version was published
+        """
+        probe = dimensions_crud.get_change_probe(db)
+        overdue = (
+            time.monotonic() - self._last_full_load
+            >= settings.DIMENSION_CACHE_FULL_RELOAD_SECONDS
+        )
+        if self._snapshot is not None and probe == self._snapshot.probe and not overdue:
+            return False
+        version = self.version
+        return self.load(db, probe).version != version
+
+    def _refresh_with_session(self) -> bool:
+        db = database.SessionLocal()
+        try:
+            return self.refresh(db)
+        finally:
+            db.close()
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(settings.DIMENSION_CACHE_REFRESH_SECONDS)
+            try:
+                await run_in_threadpool(self._refresh_with_session)
+            except Exception as e:
+                # Keep serving the last good snapshot
+                logger.error(f"Dimension cache refresh failed: {e}")
+
+    async def start(self):
+        """Initial load plus the background refresher"""
+        try:
+            await run_in_threadpool(self._refresh_with_session)
+        except Exception as e:
+            logger.error(f"Dimension cache initial load failed: {e}")
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"loaded": False}
+        return {
+            "loaded": True,
+            "version": snapshot.version,
+            "loaded_at": snapshot.loaded_at.isoformat(),
+            "dropdowns": len(snapshot.dropdowns),
+            "materials": len(snapshot.materials),
+            "customers": len(snapshot.customers),
+        }
+
+
+dimension_cache = DimensionCache()
@@ -0,0 +1,514 @@
+# app/services/dummy_data.py
+"""
+Reproducible synthetic data for load tests and benchmarks
+
+Fills every table in app/models with referentially consistent rows: the
+dropdown and approval status dimensions, customers and materials, then per
+FSP email the visits, the SR headers keyed by the visit appkey, their items
+(251 return / 252 replace), attachments and remark logs. The same scale and
+seed always produce the same rows
+
+    python -m app.services.dummy_data --url sqlite:///dummy.db --scale small
+    python -m app.services.dummy_data --url mysql+pymysql://u:p@host/db \\
+        --scale large --seed 7 --reset
+    python -m app.services.dummy_data --url sqlite:///dummy.db --emails 50 \\
+        --headers-per-email 200 --items-per-header 20
+
+Rows go in through Core executemany in batches, with foreign key checks off
+(MySQL) or synchronous writes off (SQLite) on the loading connection only
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from datetime import date, datetime, time as dtime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Table, create_engine, insert
+from sqlalchemy.engine import Connection, Engine
+
+from app.models import (
+    Base,
+    DimColorCoding,
+    DimCustomDropdown,
+    DimCustomer,
+    DimDiscount,
+    DimMara,
+    FctVisits,
+    SrDimTypeOfApprovalStat,
+    SrFctAttachment,
+    SrFctHeader,
+    SrFctItems,
+    SrFctLogsRemarksHeader,
+    SrFctLogsRemarksItems,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DataScale(NamedTuple):
+    emails: int = 10  # FSP emails, each with its own customers and headers
+    headers_per_email: int = 20
+    items_per_header: int = 10
+    attachments_per_header: int = 2
+    header_logs_per_header: int = 2
+    item_logs_per_header: int = 2  # spread over random items of the header
+    customers_per_email: int = 5
+    emails_per_rsm: int = 10
+    materials: int = 1000
+
+
+SCALES: Dict[str, DataScale] = {
+    "tiny": DataScale(emails=2, headers_per_email=5, items_per_header=4),
+    "small": DataScale(),
+    "medium": DataScale(emails=200, headers_per_email=50),
+    # ~1M items, ~1.8M rows in total
+    "large": DataScale(emails=1000, headers_per_email=100, materials=5000),
+}
+
+# Same ids as RETURN_ACTION_TYPE / REPLACE_ACTION_TYPE in app/crud/sr_sync.py
+RETURN_ACTION_TYPE = 251
+REPLACE_ACTION_TYPE = 252
+
+# Dropdown ids per header / visit foreign key
+DROPDOWNS: Dict[str, List[Tuple[int, str]]] = {
+    "typerequest": [(1, "Sales Return"), (2, "Replacement"), (3, "Pull Out")],
+    "reasonreturn": [
+        (10, "Damaged"),
+        (11, "Expired"),
+        (12, "Near Expiry"),
+        (13, "Wrong Item"),
+        (14, "Overstock"),
+    ],
+    "modereturn": [(20, "Pick Up"), (21, "Drop Off"), (22, "Courier")],
+    "status": [
+        (30, "Draft"),
+        (31, "For Approval"),
+        (32, "Approved"),
+        (33, "Rejected"),
+        (34, "Completed"),
+    ],
+    "srrtype": [(40, "Regular"), (41, "Special")],
+    "channel": [(50, "Retail"), (51, "Wholesale"), (52, "Online")],
+    "booking_status": [(60, "Booked"), (61, "Cancelled"), (62, "Served")],
+    "actiontype": [(RETURN_ACTION_TYPE, "Return"), (REPLACE_ACTION_TYPE, "Replace")],
+}
+APPROVAL_STATUSES = [
+    (1, "Submitted"),
+    (2, "Approved"),
+    (3, "Rejected"),
+    (4, "Returned"),
+]
+COLOR_CODES = [("#2E7D32", "Approved"), ("#C62828", "Rejected"), ("#F9A825", "Pending")]
+
+CITIES = ["Manila", "Quezon City", "Cebu", "Davao", "Makati", "Pasig", "Iloilo"]
+UNITS = ["PC", "BOX", "CS", "PK"]
+MATERIAL_GROUPS = 50
+
+# Every timestamp falls in BASE_TIME + TIME_SPAN so runs are reproducible
+BASE_TIME = datetime(2025, 1, 1)
+TIME_SPAN = 365 * 24 * 3600
+UPDATE_SPAN = 30 * 24 * 3600
+
+# Parents before children, the order rows are inserted in
+TABLES: List[Table] = [
+    DimCustomDropdown.__table__,
+    SrDimTypeOfApprovalStat.__table__,
+    DimColorCoding.__table__,
+    DimCustomer.__table__,
+    DimMara.__table__,
+    DimDiscount.__table__,
+    FctVisits.__table__,
+    SrFctHeader.__table__,
+    SrFctItems.__table__,
+    SrFctAttachment.__table__,
+    SrFctLogsRemarksHeader.__table__,
+    SrFctLogsRemarksItems.__table__,
+]
+
+
+def fsp_email(index: int) -> str:
+    return f"fsp{index:05d}@dummy.test"
+
+
+def rsm_email(index: int, scale: DataScale) -> str:
+    return f"rsm{index // scale.emails_per_rsm:04d}@dummy.test"
+
+
+def fsp_emails(scale: DataScale) -> List[str]:
+    """The FSP emails a load with this scale creates, for driving requests"""
+    return [fsp_email(index) for index in range(scale.emails)]
+
+
+def _fsp_code(index: int) -> str:
+    """Four character base 36 code, unique for up to 1.6M emails"""
+    digits = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    code = ""
+    for _ in range(4):
+        index, remainder = divmod(index, 36)
+        code = digits[remainder] + code
+    return code
+
+
+def _material(index: int) -> str:
+    return f"MAT{index:07d}"
+
+
+def _material_group(index: int) -> str:
+    return f"MG{index % MATERIAL_GROUPS:03d}"
+
+
+class DummyDataGenerator:
+    """Yields (table, row) pairs in insert order for one scale and seed"""
+
+    def __init__(self, scale: DataScale, seed: int = 0):
+        self.scale = scale
+        self.rng = random.Random(seed)
+
+    def _timestamp(self) -> datetime:
+        return BASE_TIME + timedelta(seconds=self.rng.randrange(TIME_SPAN))
+
+    def _later(self, moment: datetime) -> datetime:
+        return moment + timedelta(seconds=self.rng.randrange(UPDATE_SPAN))
+
+    def _dropdown(self, module: str) -> int:
+        return self.rng.choice(DROPDOWNS[module])[0]
+
+    def rows(self) -> Iterator[Tuple[Table, Dict]]:
+        yield from self._dimension_rows()
+        for email_index in range(self.scale.emails):
+            yield from self._email_rows(email_index)
+
+    # Dimensions
+    def _dimension_rows(self) -> Iterator[Tuple[Table, Dict]]:
+        for module, options in DROPDOWNS.items():
+            for dropdown_id, name in options:
+                yield DimCustomDropdown.__table__, {
+                    "id": dropdown_id,
+                    "name": name,
+                    "value": name.upper(),
+                    "description": name,
+                    "module": module,
+                    "active": "1",
+                    "created_at": BASE_TIME,
+                }
+        for status_id, description in APPROVAL_STATUSES:
+            yield SrDimTypeOfApprovalStat.__table__, {
+                "id": status_id,
+                "is_active": 1,
+                "created_date": BASE_TIME,
+                "description": description,
+            }
+        for colo, text1 in COLOR_CODES:
+            yield DimColorCoding.__table__, {
+                "colo": colo,
+                "text1": text1,
+                "module": "SR",
+            }
+
+        for index in range(self.scale.materials):
+            yield DimMara.__table__, {
+                "matnr": _material(index),
+                "matkl": _material_group(index),
+                "kbetr": Decimal(self.rng.randrange(1000, 500_000)) / 100,
+                "maktx": f"Material {index}",
+                "desc_matgrp": f"Group {index % MATERIAL_GROUPS}",
+                "erdat": BASE_TIME.date(),
+                "updat2": BASE_TIME.date(),
+                "unit": self.rng.choice(UNITS),
+            }
+
+        for email_index in range(self.scale.emails):
+            fspemail = fsp_email(email_index)
+            rsmemail = rsm_email(email_index, self.scale)
+            for kunnr in self._customers(email_index):
+                yield DimCustomer.__table__, {
+                    "kunnr": kunnr,
+                    "fspcode": _fsp_code(email_index),
+                    "name": f"Customer {kunnr}",
+                    "address": f"{self.rng.randrange(1, 999)} Main St",
+                    "city": self.rng.choice(CITIES),
+                    "fspemail": fspemail,
+                    "rsmemail": rsmemail,
+                    "timestamp": BASE_TIME,
+                }
+                groups = self.rng.sample(range(MATERIAL_GROUPS), 3)
+                for group in groups:
+                    yield DimDiscount.__table__, {
+                        "kunnr": kunnr,
+                        "matkl": _material_group(group),
+                        "datab": date(2025, 1, 1),
+                        "datbi": date(9999, 12, 31),
+                        "kbetr": Decimal(self.rng.randrange(0, 2000)) / 100,
+                        "updat": BASE_TIME,
+                        "fspemail": fspemail,
+                        "rsmemail": rsmemail,
+                    }
+
+    def _customers(self, email_index: int) -> List[str]:
+        first = email_index * self.scale.customers_per_email
+        return [
+            f"{first + offset:010d}" for offset in range(self.scale.customers_per_email)
+        ]
+
+    # Facts, one FSP email at a time
+    def _email_rows(self, email_index: int) -> Iterator[Tuple[Table, Dict]]:
+        rng = self.rng
+        scale = self.scale
+        fspemail = fsp_email(email_index)
+        rsmemail = rsm_email(email_index, scale)
+        code = _fsp_code(email_index)
+        customers = self._customers(email_index)
+
+        for header_index in range(scale.headers_per_email):
+            # keyid also keys the attachments, whose keyid column is String(20)
+            keyid = f"V{email_index:05d}-{header_index:06d}"
+            kunnr = rng.choice(customers)
+            created_at = self._timestamp()
+            updated_at = self._later(created_at)
+
+            yield FctVisits.__table__, {
+                "appkey": keyid,
+                "code": code,
+                "kunnr": kunnr,
+                "vdate": created_at.date(),
+                "name": f"Customer {kunnr}",
+                "address": f"{rng.randrange(1, 999)} Main St",
+                "t1": dtime(8, 0),
+                "t2": dtime(9, 0),
+                "fspemail": fspemail,
+                "rsmemail": rsmemail,
+                "booking_status_id": self._dropdown("booking_status"),
+                "creationdate": created_at,
+                "updatedate": updated_at,
+                "created_at": created_at,
+            }
+
+            items = []
+            return_total = replacement_total = Decimal("0.00")
+            for item_index in range(scale.items_per_header):
+                action_type = rng.choice((RETURN_ACTION_TYPE, REPLACE_ACTION_TYPE))
+                qty = rng.randrange(1, 50)
+                srp = Decimal(rng.randrange(1000, 500_000)) / 100
+                discount = Decimal(rng.randrange(0, 2000)) / 100
+                total_amount = srp * qty
+                net_total_amount = total_amount * (1 - discount / 100)
+                if action_type == RETURN_ACTION_TYPE:
+                    return_total += net_total_amount
+                else:
+                    replacement_total += net_total_amount
+                item_updated_at = self._later(created_at)
+                items.append(
+                    {
+                        "appkey": f"I{email_index:05d}-{header_index:06d}-"
+                        f"{item_index:03d}",
+                        "matnr": _material(rng.randrange(scale.materials)),
+                        "fk_actiontype": action_type,
+                        "keyid": keyid,
+                        "discount": discount,
+                        "qty": qty,
+                        "srp": srp,
+                        "total_amount": total_amount,
+                        "net_price": (srp * (1 - discount / 100)).quantize(
+                            Decimal("0.01")
+                        ),
+                        "net_total_amount": net_total_amount.quantize(Decimal("0.01")),
+                        "created_at": created_at,
+                        "updated_at": item_updated_at,
+                        "m_created_at": created_at,
+                        "m_updated_at": item_updated_at,
+                        "code": code,
+                        "fspemail": fspemail,
+                        "rsmemail": rsmemail,
+                    }
+                )
+
+            yield SrFctHeader.__table__, {
+                "appkey": f"H{email_index:05d}-{header_index:06d}",
+                "keyid": keyid,
+                "fk_typerequest": self._dropdown("typerequest"),
+                "fk_reasonreturn": self._dropdown("reasonreturn"),
+                "fk_modereturn": self._dropdown("modereturn"),
+                "fk_status": self._dropdown("status"),
+                "channel": self._dropdown("channel"),
+                "fk_srrtype": self._dropdown("srrtype"),
+                "kunnr": kunnr,
+                "code": code,
+                "updated_shiptocode": kunnr[-10:],
+                "return_total": return_total.quantize(Decimal("0.01")),
+                "replacement_total": replacement_total.quantize(Decimal("0.01")),
+                "total_amount": (return_total + replacement_total).quantize(
+                    Decimal("0.01")
+                ),
+                "fspemail": fspemail,
+                "rsmemail": rsmemail,
+                "created_at": created_at,
+                "updated_at": updated_at,
+                "m_created_at": created_at,
+                "m_updated_at": updated_at,
+                "created_by": fspemail,
+            }
+            for item in items:
+                yield SrFctItems.__table__, item
+
+            for attachment_index in range(scale.attachments_per_header):
+                appkey = f"A{email_index:05d}-{header_index:06d}-{attachment_index:02d}"
+                yield SrFctAttachment.__table__, {
+                    "appkey": appkey,
+                    "keyid": keyid,
+                    "image_tag": "proof",
+                    "is_active": True,
+                    "table_name": "sr_fct_header",
+                    "file_name": f"{appkey}.jpg",
+                    "file_path": f"/uploads/sr/{keyid}/{appkey}.jpg",
+                    "created_at": created_at,
+                    "updated_at": updated_at,
+                    "m_created_at": created_at,
+                    "m_updated_at": updated_at,
+                    "upload_state": 1,
+                    "uploaded_by": fspemail,
+                }
+
+            for log_index in range(scale.header_logs_per_header):
+                yield SrFctLogsRemarksHeader.__table__, self._log_row(
+                    f"LH{email_index:05d}-{header_index:06d}-{log_index:02d}",
+                    keyid,
+                    created_at,
+                    rsmemail,
+                )
+            for log_index in range(scale.item_logs_per_header if items else 0):
+                yield SrFctLogsRemarksItems.__table__, self._log_row(
+                    f"LI{email_index:05d}-{header_index:06d}-{log_index:02d}",
+                    rng.choice(items)["appkey"],
+                    created_at,
+                    rsmemail,
+                )
+
+    def _log_row(
+        self, appkey: str, keyid: str, created_at: datetime, created_by: str
+    ) -> Dict:
+        status_id, description = self.rng.choice(APPROVAL_STATUSES)
+        logged_at = self._later(created_at)
+        return {
+            "appkey": appkey,
+            "keyid": keyid,
+            "fk_typeapprovalstatus": status_id,
+            "remarks": f"{description} by {created_by}",
+            "created_at": logged_at,
+            "updated_at": logged_at,
+            "m_created_at": logged_at,
+            "m_updated_at": logged_at,
+            "type_remarks": description,
+            "created_by": created_by,
+        }
+
+
+def _prepare_connection(connection: Connection):
+    """Session-level settings that speed up the load on this connection only"""
+    dialect = connection.dialect.name
+    if dialect in ("mysql", "mariadb"):
+        connection.exec_driver_sql("SET SESSION foreign_key_checks = 0")
+        connection.exec_driver_sql("SET SESSION unique_checks = 0")
+    elif dialect == "sqlite":
+        connection.exec_driver_sql("PRAGMA synchronous = OFF")
+
+
+def load_dummy_data(
+    engine: Engine,
+    scale: DataScale,
+    seed: int = 0,
+    batch_size: int = 5000,
+    reset: bool = False,
+) -> Dict[str, int]:
+    """
+    Create the tables if needed and insert the generated rows, committing
+    every batch_size rows. With reset the tables are dropped first.
+    Returns the row count per table
+    """
+    if reset:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    buffers: Dict[Table, List[Dict]] = {table: [] for table in TABLES}
+    counts: Dict[str, int] = {table.name: 0 for table in TABLES}
+    buffered = 0
+
+    def flush(connection: Connection):
+        # Whole batch in table order so parents land before their children
+        for table, rows in buffers.items():
+            if rows:
+                connection.execute(insert(table), rows)
+                counts[table.name] += len(rows)
+                rows.clear()
+        connection.commit()
+
+    with engine.connect() as connection:
+        _prepare_connection(connection)
+        for table, row in DummyDataGenerator(scale, seed).rows():
+            buffers[table].append(row)
+            buffered += 1
+            if buffered >= batch_size:
+                flush(connection)
+                buffered = 0
+        flush(connection)
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--url", help="database URL (default: DATABASE_URL from the settings)"
+    )
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument(
+        "--reset", action="store_true", help="drop and recreate the tables first"
+    )
+    # Knobs overriding the preset
+    for field in DataScale._fields:
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, dest=field)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    overrides = {
+        field: getattr(args, field)
+        for field in DataScale._fields
+        if getattr(args, field) is not None
+    }
+    scale = SCALES[args.scale]._replace(**overrides)
+
+    url = args.url
+    if url is None:
+        from app.core.config import get_settings
+
+        url = get_settings().DATABASE_URL
+    engine = create_engine(url)
+
+    started = time.perf_counter()
+    try:
+        counts = load_dummy_data(
+            engine, scale, seed=args.seed, batch_size=args.batch_size, reset=args.reset
+        )
+    except Exception as e:
+        logger.error(f"Dummy data load failed: {e}")
+        return 1
+    finally:
+        engine.dispose()
+    elapsed = time.perf_counter() - started
+
+    total = sum(counts.values())
+    for table_name, count in counts.items():
+        logger.info(f"{table_name}: {count} rows")
+    logger.info(
+        f"Loaded {total} rows in {elapsed:.1f}s ({total / elapsed:.0f} rows/s) "
+        f"for {scale.emails} emails, e.g. {fsp_email(0)}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# app/testing/pytest_plugin.py
+"""
+pytest fixtures and a marker that put a ceiling on SQL per endpoint
+
+Enable with `-p app.testing.pytest_plugin` (or `pytest_plugins` in a
+conftest.py). Statements are counted through the per-request QueryStats
+(app/db/query_stats.py): the counter begins one in the test's context and
+every request made from it (TestClient and httpx ASGITransport copy the
+context) adds to it, so background work such as the startup checks or the
+dimension cache refresh is never counted
+
+    @pytest.mark.max_queries(4)
+    def test_sync(client):
+        client.get("/api/v1/sr/sync/", params={"email": EMAIL})
+
+    def test_headers(client, assert_max_queries):
+        with assert_max_queries(2):
+            client.get("/api/v1/sr/headers/", params={"email": EMAIL})
+
+    def test_serialization(client, no_lazy_loads):
+        ...  # any relationship lazy load raises LazyLoadError
+"""
+
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+import pytest
+
+from app.db.lazy_loads import set_lazy_load_policy
+from app.db.query_stats import QueryStats, begin_query_stats, end_query_stats
+
+
+class QueryCounter:
+    """SQL run from this context, requests included, while the counter is active"""
+
+    def __init__(self):
+        self.stats: Optional[QueryStats] = None
+        self._token = None
+
+    @property
+    def count(self) -> int:
+        return self.stats.count if self.stats is not None else 0
+
+    @property
+    def statements(self) -> List[str]:
+        return self.stats.statements if self.stats is not None else []
+
+    def __enter__(self) -> "QueryCounter":
+        self.stats, self._token = begin_query_stats(keep_statements=True)
+        return self
+
+    def __exit__(self, *exc_info):
+        end_query_stats(self._token)
+
+    def report(self) -> str:
+        return "\n".join(
+            f"  {index}. {' '.join(statement.split())}"
+            for index, statement in enumerate(self.statements, 1)
+        )
+
+
+def _fail_if_over(counter: QueryCounter, limit: int, what: str):
+    if counter.count > limit:
+        pytest.fail(
+            f"{what} ran {counter.count} SQL statements, the limit is {limit}:\n"
+            f"{counter.report()}",
+            pytrace=False,
+        )
+
+
+@pytest.fixture
+def count_queries():
+    """Factory for QueryCounter context managers"""
+    return QueryCounter
+
+
+@pytest.fixture
+def assert_max_queries(count_queries):
+    """Context manager failing the test when the block runs more than limit statements"""
+
+    @contextmanager
+    def check(limit: int) -> Iterator[QueryCounter]:
+        with count_queries() as counter:
+            yield counter
+        _fail_if_over(counter, limit, "Block")
+
+    return check
+
+
+@pytest.fixture
+def no_lazy_loads():
+    """Relationship lazy loads raise LazyLoadError for the duration of the test"""
+    previous = set_lazy_load_policy("raise")
+    yield
+    set_lazy_load_policy(previous)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "max_queries(limit): fail when the test runs more than limit SQL statements",
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("max_queries")
+    if marker is None:
+        return (yield)
+    with QueryCounter() as counter:
+        result = yield
+    _fail_if_over(counter, marker.args[0], item.name)
+    return result
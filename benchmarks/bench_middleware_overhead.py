@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the per-request cost of the request ID / logging middleware
+Drives a trivial FastAPI route directly over ASGI (no sockets) with no
+middleware, with the old pair of BaseHTTPMiddleware layers and with the
+pure ASGI RequestContextMiddleware. Logging is disabled so only the
+middleware mechanics are measured
+
+    python -m benchmarks.bench_middleware_overhead
+    python -m benchmarks.bench_middleware_overhead --requests 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.middleware import RequestContextMiddleware
+
+
+class LegacyRequestIDMiddleware(BaseHTTPMiddleware):
+    """The previous RequestIDMiddleware"""
+
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    """The previous LoggingMiddleware timing/header work (its log calls are no-ops here)"""
+
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        response.headers["X-Process-Time"] = str(round(process_time, 4))
+        return response
+
+
+def make_app(variant: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    if variant == "legacy":
+        app.add_middleware(LegacyLoggingMiddleware)
+        app.add_middleware(LegacyRequestIDMiddleware)
+    elif variant == "asgi":
+        app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+def make_scope() -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+
+async def run(app: FastAPI, requests: int) -> float:
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    # Warm up (builds the middleware stack and route caches)
+    for _ in range(200):
+        await app(make_scope(), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(make_scope(), receive, send)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    results = {}
+    for variant in ("none", "legacy", "asgi"):
+        app = make_app(variant)
+        best = min(asyncio.run(run(app, args.requests)) for _ in range(args.repeat))
+        results[variant] = best / args.requests * 1e6
+
+    baseline = results["none"]
+    print(f"{'variant':>8} {'us/request':>11} {'overhead us':>12}")
+    for variant, per_request in results.items():
+        print(f"{variant:>8} {per_request:11.1f} {per_request - baseline:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
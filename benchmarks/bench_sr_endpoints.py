@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark for the SR endpoints
+Seeds a SQLite database per scale with app/services/dummy_data.py, points
+DATABASE_URL at it and drives GET /sr/sync, /sr/headers, /sr/items and
+/sr/attachments through the whole app (lifespan, middleware, routers, CRUD,
+serialization, compression) both in-process over ASGI and over a real
+uvicorn socket. Each scale runs in its own process since the app builds its
+engine from DATABASE_URL at import. Requests rotate over
+the generated FSP emails. Reports p50/p95/p99 latency, throughput, SQL
+statements per request and peak RSS, and saves them as JSON
+
+    python -m benchmarks.bench_sr_endpoints
+    python -m benchmarks.bench_sr_endpoints --scales small,medium --concurrency 16
+    python -m benchmarks.bench_sr_endpoints --output after.json \\
+        --baseline before.json --threshold 0.15   # exit status 1 on a regression
+
+The response cache is off unless --cache is given, so every request reaches
+the database. Peak RSS is the benchmark process's maximum so far (app and
+client share the process in both modes), seeding included
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+ENDPOINTS = {
+    "sync": "/api/v1/sr/sync/",
+    "headers": "/api/v1/sr/headers/",
+    "items": "/api/v1/sr/items/",
+    "attachments": "/api/v1/sr/attachments/",
+}
+MODES = ("asgi", "uvicorn")
+
+# Compared against the baseline; a higher value is a regression for both
+REGRESSION_METRICS = ("p95_ms", "p99_ms")
+
+
+def database_path(db_dir: str, scale_name: str, seed: int) -> str:
+    return os.path.abspath(os.path.join(db_dir, f"bench_{scale_name}_{seed}.db"))
+
+
+def configure_environment(cache: bool, path: str):
+    """Settings the app reads at import time, before anything from app is imported"""
+    for name in ("DB_NAME", "DB_USER", "DB_PASSWORD", "DB_HOST", "SECRET_KEY"):
+        os.environ.setdefault(name, "benchmark")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ["DB_ASYNC"] = "false"
+    os.environ["SYNC_CACHE_BACKEND"] = "memory" if cache else "none"
+    os.environ.pop("METRICS_MULTIPROC_DIR", None)
+
+
+def seed_database(path: str, scale_name: str, seed: int):
+    """Load the dummy data through the app's own engine when the file is new"""
+    from app.db.database import engine
+    from app.services.dummy_data import SCALES, load_dummy_data
+
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        return
+    start = time.perf_counter()
+    counts = load_dummy_data(engine, SCALES[scale_name], seed=seed)
+    print(
+        f"Seeded {scale_name}: {sum(counts.values())} rows in "
+        f"{time.perf_counter() - start:.1f}s ({path})"
+    )
+
+
+async def wait_ready(client, timeout: float = 60.0):
+    """Wait for the background startup checks to flip /ready"""
+    deadline = time.monotonic() + timeout
+    while (await client.get("/ready")).status_code != 200:
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"/ready not reached within {timeout:.0f}s")
+        await asyncio.sleep(0.05)
+
+
+class StatementCounter:
+    """SQL statements sent through the engine, read as a running total"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        self._lock = threading.Lock()
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            self.count += 1
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+async def drive(
+    client, path: str, emails: List[str], requests: int, concurrency: int
+) -> Tuple[List[float], int, int, float]:
+    """(latencies, error count, bytes received, wall time) for requests GETs"""
+    latencies: List[float] = []
+    errors = 0
+    received = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal errors, received, next_index
+        while next_index < requests:
+            index = next_index
+            next_index += 1
+            params = {"email": emails[index % len(emails)]}
+            start = time.perf_counter()
+            response = await client.get(path, params=params)
+            latencies.append(time.perf_counter() - start)
+            received += response.num_bytes_downloaded
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, received, time.perf_counter() - start
+
+
+async def run_endpoints(
+    client, emails: List[str], counter: StatementCounter, args
+) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for name, path in ENDPOINTS.items():
+        await drive(client, path, emails, args.warmup, args.concurrency)
+        statements_before = counter.count
+        latencies, errors, received, wall_time = await drive(
+            client, path, emails, args.requests, args.concurrency
+        )
+        latencies.sort()
+        results[name] = {
+            "requests": len(latencies),
+            "errors": errors,
+            "concurrency": args.concurrency,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p95_ms": percentile(latencies, 0.95) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "mean_ms": statistics.fmean(latencies) * 1000,
+            "throughput_rps": len(latencies) / wall_time,
+            "queries_per_request": (counter.count - statements_before) / len(latencies),
+            "bytes_per_request": received / len(latencies),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+    return results
+
+
+async def run_asgi(app, emails, counter, args):
+    import httpx
+
+    # ASGITransport sends no lifespan events, so run the app's lifespan here
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            await wait_ready(client)
+            return await run_endpoints(client, emails, counter, args)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_uvicorn(app, emails, counter, args):
+    """Same workload over HTTP to a uvicorn server running in a thread"""
+    import httpx
+    import uvicorn
+
+    port = _free_port()
+    config = uvicorn.Config(
+        app,
+        host="127.0.0.1",
+        port=port,
+        lifespan="on",
+        log_level="warning",
+        access_log=False,
+    )
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("uvicorn failed to start")
+        await asyncio.sleep(0.01)
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60
+        ) as client:
+            await wait_ready(client)
+            return await run_endpoints(client, emails, counter, args)
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: List[Dict], baseline: Dict, threshold: float) -> List[str]:
+    """Regressions against a previous results file, as printable lines"""
+    previous = {
+        (row["mode"], row["scale"], row["endpoint"]): row for row in baseline["results"]
+    }
+    regressions = []
+    for row in results:
+        before = previous.get((row["mode"], row["scale"], row["endpoint"]))
+        if before is None:
+            continue
+        for metric in REGRESSION_METRICS:
+            if before[metric] > 0 and row[metric] > before[metric] * (1 + threshold):
+                regressions.append(
+                    f"{row['mode']}/{row['scale']}/{row['endpoint']} {metric}: "
+                    f"{before[metric]:.1f} -> {row[metric]:.1f} "
+                    f"(+{(row[metric] / before[metric] - 1) * 100:.0f}%)"
+                )
+        if row["throughput_rps"] < before["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{row['mode']}/{row['scale']}/{row['endpoint']} throughput_rps: "
+                f"{before['throughput_rps']:.1f} -> {row['throughput_rps']:.1f}"
+            )
+    return regressions
+
+
+def print_table(results: List[Dict]):
+    print(
+        f"{'mode':>8} {'scale':>7} {'endpoint':>12} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'req/s':>8} {'queries':>8} {'KiB':>8} {'RSS MB':>8} "
+        f"{'errors':>6}"
+    )
+    for row in results:
+        print(
+            f"{row['mode']:>8} {row['scale']:>7} {row['endpoint']:>12} "
+            f"{row['p50_ms']:8.1f} {row['p95_ms']:8.1f} {row['p99_ms']:8.1f} "
+            f"{row['throughput_rps']:8.1f} {row['queries_per_request']:8.1f} "
+            f"{row['bytes_per_request'] / 1024:8.1f} {row['peak_rss_mb']:8.1f} "
+            f"{row['errors']:6d}"
+        )
+
+
+def run_scale(scale_name: str, modes: List[str], args) -> List[Dict]:
+    """Seed the scale's database and benchmark the app running on it"""
+    path = database_path(args.db_dir, scale_name, args.seed)
+    if args.reseed and os.path.exists(path):
+        os.remove(path)
+    configure_environment(args.cache, path)
+    logging.disable(logging.CRITICAL)
+
+    from app.db.database import engine
+    from app.main import app
+    from app.services.dummy_data import SCALES, fsp_emails
+
+    seed_database(path, scale_name, args.seed)
+    counter = StatementCounter(engine)
+    emails = fsp_emails(SCALES[scale_name])
+
+    results = []
+    for mode in modes:
+        runner = run_asgi if mode == "asgi" else run_uvicorn
+        endpoint_results = asyncio.run(runner(app, emails, counter, args))
+        for endpoint, metrics in endpoint_results.items():
+            results.append(
+                {"mode": mode, "scale": scale_name, "endpoint": endpoint, **metrics}
+            )
+    return results
+
+
+def run_scale_process(scale_name: str, args) -> List[Dict]:
+    """run_scale in a child process, the app's engine is fixed per process"""
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "results.json")
+        command = [
+            sys.executable,
+            "-m",
+            "benchmarks.bench_sr_endpoints",
+            "--scales",
+            scale_name,
+            "--modes",
+            args.modes,
+            "--requests",
+            str(args.requests),
+            "--warmup",
+            str(args.warmup),
+            "--concurrency",
+            str(args.concurrency),
+            "--seed",
+            str(args.seed),
+            "--db-dir",
+            args.db_dir,
+            "--output",
+            output,
+        ]
+        if args.reseed:
+            command.append("--reseed")
+        if args.cache:
+            command.append("--cache")
+        # Exit status 1 only means some requests failed, the rows say which
+        if subprocess.run(command).returncode not in (0, 1):
+            raise RuntimeError(f"Benchmark for scale {scale_name} failed")
+        with open(output, encoding="utf8") as f:
+            return json.load(f)["results"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", default="tiny,small", help="comma separated")
+    parser.add_argument("--modes", default=",".join(MODES), help="asgi,uvicorn")
+    parser.add_argument("--requests", type=int, default=200, help="per endpoint")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db-dir", default="cache", help="where seeded databases go")
+    parser.add_argument("--reseed", action="store_true")
+    parser.add_argument("--cache", action="store_true", help="keep the sync cache on")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="allowed relative slowdown against the baseline",
+    )
+    args = parser.parse_args()
+
+    # Models only, app.db (and with it the engine) is imported per scale
+    from app.services.dummy_data import SCALES
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    scales = [scale.strip() for scale in args.scales.split(",") if scale.strip()]
+    for scale_name in scales:
+        if scale_name not in SCALES:
+            parser.error(f"unknown scale {scale_name}, pick from {sorted(SCALES)}")
+    for mode in modes:
+        if mode not in MODES:
+            parser.error(f"unknown mode {mode}, pick from {list(MODES)}")
+
+    os.makedirs(args.db_dir, exist_ok=True)
+    if len(scales) == 1:
+        results = run_scale(scales[0], modes, args)
+    else:
+        results = []
+        for scale_name in scales:
+            results.extend(run_scale_process(scale_name, args))
+
+    print_table(results)
+
+    if args.output:
+        report = {
+            "meta": {
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "git_revision": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "args": vars(args),
+            },
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"Regressions beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+    if any(row["errors"] for row in results):
+        print("Some requests failed, see the errors column")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the CRUDSrSync payload grouping stage
+Compares the single-pass (keyid, fk_actiontype) bucketing against the old
+per-header scan, using in-memory rows so no database is needed
+
+    python -m benchmarks.bench_sr_sync_grouping
+    python -m benchmarks.bench_sr_sync_grouping --items-per-header 20 --legacy-max 10000
+"""
+
+import argparse
+import time
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.crud.sr_sync import (
+    sr_sync_crud,
+    RETURN_ACTION_TYPE,
+    REPLACE_ACTION_TYPE,
+)
+
+SCALES = [1_000, 5_000, 10_000, 25_000, 50_000]
+EMAIL = "fsp@felco.test"
+
+
+def make_rows(total_items: int, items_per_header: int):
+    """Build header/item/attachment/visit rows shaped like the ORM entities"""
+    now = datetime(2024, 1, 1, 8, 0, 0)
+    header_count = max(1, total_items // items_per_header)
+
+    headers, items, attachments, visits = [], [], [], []
+    for h in range(header_count):
+        keyid = f"V{h:08d}"
+        headers.append(
+            SimpleNamespace(
+                appkey=f"H{h:08d}",
+                keyid=keyid,
+                fk_typerequest=1,
+                fk_reasonreturn=2,
+                fk_modereturn=3,
+                fk_status=4,
+                fk_srrtype=5,
+                code="F001",
+                created_at=now,
+                updated_shiptocode="S001",
+                sdo_pao_remarks=None,
+                ssa_remarks=None,
+                approver_remarks=None,
+                remarks_return=None,
+                fspemail=EMAIL,
+                rsmemail="rsm@felco.test",
+                updated_at=now,
+                m_updated_at=now,
+            )
+        )
+        visits.append(
+            SimpleNamespace(appkey=keyid, kunnr="C001", name="Customer", address="Addr")
+        )
+        attachments.append(
+            SimpleNamespace(
+                appkey=f"T{h:08d}",
+                keyid=keyid,
+                file_name="photo.jpg",
+                image=None,
+                file_path="/uploads/photo.jpg",
+                created_at=now,
+                is_active=True,
+                updated_at=now,
+                m_updated_at=now,
+            )
+        )
+
+    for i in range(header_count * items_per_header):
+        items.append(
+            SimpleNamespace(
+                id=i,
+                appkey=f"I{i:09d}",
+                keyid=f"V{i % header_count:08d}",
+                matnr="MAT0001",
+                fk_actiontype=RETURN_ACTION_TYPE if i % 2 else REPLACE_ACTION_TYPE,
+                discount=Decimal("0.00"),
+                qty=1,
+                srp=Decimal("10.00"),
+                total_amount=Decimal("10.00"),
+                net_price=Decimal("10.00"),
+                net_total_amount=Decimal("10.00"),
+                fsp_remarks=None,
+                ssa_remarks=None,
+                dr_number=None,
+                dr_date=None,
+                code="F001",
+                is_sdo=0,
+                updated_at=now,
+                m_updated_at=now,
+            )
+        )
+    return headers, items, attachments, visits
+
+
+def legacy_grouping(headers, items):
+    """Old per-header scan: O(headers x items)"""
+    grouped = []
+    for header in headers:
+        header_items = [item for item in items if item.keyid == header.keyid]
+        return_items = [
+            i for i in header_items if i.fk_actiontype == RETURN_ACTION_TYPE
+        ]
+        replace_items = [
+            i for i in header_items if i.fk_actiontype == REPLACE_ACTION_TYPE
+        ]
+        grouped.append((return_items, replace_items))
+    return grouped
+
+
+def single_pass_grouping(headers, items, attachments):
+    items_by_key, _ = sr_sync_crud._group_by_keyid(items, attachments)
+    return [
+        (
+            items_by_key.get((header.keyid, RETURN_ACTION_TYPE), ()),
+            items_by_key.get((header.keyid, REPLACE_ACTION_TYPE), ()),
+        )
+        for header in headers
+    ]
+
+
+def timed(fn, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items-per-header", type=int, default=10)
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=25_000,
+        help="Skip the quadratic legacy grouping above this many items",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'items':>8} {'headers':>8} {'legacy ms':>10} {'grouping ms':>12} "
+        f"{'build ms':>10} {'build us/item':>14}"
+    )
+    for total in SCALES:
+        headers, items, attachments, visits = make_rows(total, args.items_per_header)
+
+        legacy = (
+            f"{timed(legacy_grouping, headers, items, repeat=1) * 1000:10.1f}"
+            if total <= args.legacy_max
+            else f"{'skipped':>10}"
+        )
+        grouping = timed(
+            single_pass_grouping, headers, items, attachments, repeat=args.repeat
+        )
+        build = timed(
+            sr_sync_crud._build_sr_data,
+            EMAIL,
+            headers,
+            items,
+            attachments,
+            visits,
+            repeat=args.repeat,
+        )
+        print(
+            f"{len(items):>8} {len(headers):>8} {legacy} {grouping * 1000:12.2f} "
+            f"{build * 1000:10.1f} {build / len(items) * 1e6:14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
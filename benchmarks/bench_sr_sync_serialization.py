@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark for building and encoding the GET /sr/sync response body
+Compares the validated path (SrSyncItemData/SrSyncHeaderData models, then
+FastAPI re-validating SuccessResponse[SrSyncResponse] and json.dumps) with
+the fast path (plain dicts from trusted rows, one pydantic-core to_json pass),
+and reports the cost of enrich=true label resolution from the dimension cache
+
+    python -m benchmarks.bench_sr_sync_serialization
+    python -m benchmarks.bench_sr_sync_serialization --repeat 9
+
+Every variant runs once untimed first (pydantic builds its validators and
+serializers lazily), then the median of --repeat timed runs is reported
+"""
+
+import argparse
+import gc
+import json
+import statistics
+import time
+from datetime import datetime, timezone
+
+from pydantic import TypeAdapter
+
+from app.core.responses import dump_json, success_envelope_prefix
+from app.crud.sr_sync import (
+    sr_sync_crud,
+    HEADER_LABEL_FIELDS,
+    RETURN_ACTION_TYPE,
+    REPLACE_ACTION_TYPE,
+)
+from app.schemas.base import SuccessResponse
+from app.schemas.sr_sync import SrSyncHeaderData, SrSyncItemData, SrSyncResponse
+from app.services.dimension_cache import (
+    DimensionSnapshot,
+    DropdownLabel,
+    MaterialInfo,
+    dimension_cache,
+)
+from benchmarks.bench_sr_sync_grouping import EMAIL, make_rows
+
+SCALES = [1_000, 10_000, 100_000]
+MESSAGE = "Successfully retrieved all Sales Return data"
+
+response_adapter = TypeAdapter(SuccessResponse[SrSyncResponse])
+
+
+def validated_path(headers, items, attachments, visits) -> bytes:
+    """Models per item and header, then response_model validation and json.dumps"""
+    sr_data = sr_sync_crud._build_sr_data(EMAIL, headers, items, attachments, visits)
+    items_by_key, _ = sr_sync_crud._group_by_keyid(items, ())
+    header_models = []
+    for header, header_data in zip(headers, sr_data["header"]):
+        header_models.append(
+            SrSyncHeaderData(
+                **{
+                    **header_data,
+                    "return_items": [
+                        SrSyncItemData.from_sr_item(item)
+                        for item in items_by_key.get(
+                            (header.keyid, RETURN_ACTION_TYPE), ()
+                        )
+                    ],
+                    "replace_items": [
+                        SrSyncItemData.from_sr_item(item)
+                        for item in items_by_key.get(
+                            (header.keyid, REPLACE_ACTION_TYPE), ()
+                        )
+                    ],
+                }
+            )
+        )
+    content = SuccessResponse(
+        data=SrSyncResponse(**{**sr_data, "header": header_models}),
+        message=MESSAGE,
+    )
+    # What FastAPI does for a response_model route returning a model
+    validated = response_adapter.validate_python(content, from_attributes=True)
+    return json.dumps(
+        response_adapter.dump_python(validated, mode="json"),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode()
+
+
+def fast_path(headers, items, attachments, visits) -> bytes:
+    sr_data = sr_sync_crud._build_sr_data(EMAIL, headers, items, attachments, visits)
+    return success_envelope_prefix(MESSAGE) + dump_json(sr_data) + b"}"
+
+
+def without_enrichment(doc):
+    """Drop the null enrich=true fields the models emit and the fast path omits"""
+    for header in doc["data"]["header"]:
+        for _, label_field in HEADER_LABEL_FIELDS:
+            header.pop(label_field)
+        for item in header["return_items"] + header["replace_items"]:
+            item.pop("maktx")
+            item.pop("unit")
+    return doc
+
+
+def load_dimensions(items):
+    """Fill the dimension cache with a label for every id/matnr the rows use"""
+    dimension_cache._snapshot = DimensionSnapshot(
+        version="benchmark",
+        loaded_at=datetime.now(timezone.utc),
+        probe=(),
+        dropdowns={
+            id: DropdownLabel(id, f"Label {id}", f"V{id}", "SR", "1")
+            for id in (1, 2, 3, 4, 5, RETURN_ACTION_TYPE, REPLACE_ACTION_TYPE)
+        },
+        materials={
+            item.matnr: MaterialInfo(item.matnr, "Material description", "PC", "M01")
+            for item in items
+        },
+        customers={},
+    )
+
+
+def enrich(headers, items, attachments, visits) -> float:
+    """Seconds spent in enrich_sr_data alone (the build is excluded)"""
+    sr_data = sr_sync_crud._build_sr_data(EMAIL, headers, items, attachments, visits)
+    gc.collect()
+    start = time.perf_counter()
+    sr_sync_crud.enrich_sr_data(sr_data)
+    return time.perf_counter() - start
+
+
+def timed(fn, *args, repeat: int = 5) -> float:
+    """Median seconds over repeat runs, after one untimed warm-up run"""
+    fn(*args)
+    durations = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn(*args)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items-per-header", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per variant")
+    args = parser.parse_args()
+
+    print(
+        f"{'items':>8} {'validated ms':>13} {'fast ms':>9} {'speedup':>8} "
+        f"{'body KiB':>9} {'enrich ms':>10} {'enrich us/item':>15}"
+    )
+    for total in SCALES:
+        rows = make_rows(total, args.items_per_header)
+
+        # Both paths must produce the same document (timestamps aside)
+        validated_doc = without_enrichment(json.loads(validated_path(*rows)))
+        fast_doc = json.loads(fast_path(*rows))
+        validated_doc.pop("timestamp")
+        fast_doc.pop("timestamp")
+        assert validated_doc == fast_doc, "fast path output differs"
+
+        validated = timed(validated_path, *rows, repeat=args.repeat)
+        fast = timed(fast_path, *rows, repeat=args.repeat)
+        size = len(fast_path(*rows)) / 1024
+
+        load_dimensions(rows[1])
+        enrich(*rows)
+        enriched = statistics.median(enrich(*rows) for _ in range(args.repeat))
+        dimension_cache._snapshot = None
+
+        print(
+            f"{total:>8} {validated * 1000:13.1f} {fast * 1000:9.1f} "
+            f"{validated / fast:7.1f}x {size:9.0f} {enriched * 1000:10.1f} "
+            f"{enriched / total * 1e6:15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# tests/conftest.py
+"""
+The app runs unchanged on a SQLite file seeded with the tiny dummy data
+scale. Settings are read at import time, so the environment is set before
+anything from app is imported
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+import pytest
+
+_db_dir = tempfile.mkdtemp(prefix="sr_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ["ENVIRONMENT"] = "test"
+os.environ["DB_ASYNC"] = "false"
+os.environ["SYNC_CACHE_BACKEND"] = "memory"
+for _name in ("DB_NAME", "DB_USER", "DB_PASSWORD", "DB_HOST", "SECRET_KEY"):
+    os.environ.setdefault(_name, "test")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.db import database  # noqa: E402
+from app.services.dummy_data import SCALES, fsp_email, load_dummy_data  # noqa: E402
+
+pytest_plugins = ["app.testing.pytest_plugin"]
+
+SCALE = SCALES["tiny"]
+EMAIL = fsp_email(0)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    database.engine.dispose()
+    shutil.rmtree(_db_dir, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def seeded_db():
+    load_dummy_data(database.engine, SCALE)
+    return database.engine
+
+
+@pytest.fixture(scope="session")
+def client(seeded_db):
+    """App client, returned once the background startup checks are done"""
+    from app.main import app
+
+    with TestClient(app) as client:
+        deadline = time.monotonic() + 30
+        while client.get("/ready").status_code != 200:
+            if time.monotonic() > deadline:
+                pytest.fail("/ready not reached within 30s")
+            time.sleep(0.05)
+        yield client
+
+
+@pytest.fixture
+def email():
+    return EMAIL
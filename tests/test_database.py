@@ -0,0 +1,23 @@
+# tests/test_database.py
+"""Pool warm-up and statistics helpers in app/db/database.py"""
+
+import asyncio
+
+from app.db import database
+
+
+def test_warm_up_with_nothing_to_open(seeded_db):
+    # pool_size 0, or DB_POOL_WARMUP_CONNECTIONS=0, gives a target of 0
+    assert database._warm_up_sync_pool(0) == 0
+    asyncio.run(database.warm_up_pools(0))
+
+
+def test_warm_up_opens_connections(seeded_db):
+    assert database._warm_up_sync_pool(2) == 2
+
+
+def test_pool_statistics_keys(client):
+    stats = database.pool_statistics()["sync"]
+    for key in ("size", "checked_out", "overflow"):
+        assert key in stats
+    assert not any(key.startswith("db_pool_") for key in stats)
@@ -0,0 +1,48 @@
+# tests/test_dimension_cache.py
+"""The dimension cache version identifies the loaded content, not the process"""
+
+from sqlalchemy import select, update
+
+from app.db import database
+from app.models import DimMara
+from app.services.dimension_cache import DimensionCache
+
+
+def test_version_is_the_same_in_every_process(seeded_db):
+    # Two caches stand in for two workers, or one worker before and after a restart
+    first, second = DimensionCache(), DimensionCache()
+    with database.SessionLocal() as db:
+        first.load(db)
+        second.load(db)
+        assert first.version and first.version == second.version
+
+        # An overdue full reload of the same rows keeps the version
+        assert first.refresh(db) is False
+        first._last_full_load = 0.0
+        assert first.refresh(db) is False
+        assert first.version == second.version
+
+
+def test_version_changes_with_the_content(seeded_db):
+    cache = DimensionCache()
+    with seeded_db.begin() as conn:
+        matnr = conn.execute(select(DimMara.matnr).limit(1)).scalar_one()
+        maktx = conn.execute(
+            select(DimMara.maktx).where(DimMara.matnr == matnr)
+        ).scalar_one()
+    try:
+        with database.SessionLocal() as db:
+            cache.load(db)
+            before = cache.version
+        with seeded_db.begin() as conn:
+            conn.execute(
+                update(DimMara).where(DimMara.matnr == matnr).values(maktx="Renamed")
+            )
+        with database.SessionLocal() as db:
+            cache.load(db)
+        assert cache.version != before
+    finally:
+        with seeded_db.begin() as conn:
+            conn.execute(
+                update(DimMara).where(DimMara.matnr == matnr).values(maktx=maktx)
+            )
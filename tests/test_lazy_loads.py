@@ -0,0 +1,51 @@
+# tests/test_lazy_loads.py
+"""The lazy-load detector behind LAZY_LOAD_POLICY and the no_lazy_loads fixture"""
+
+import logging
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.db import database
+from app.db.lazy_loads import LazyLoadError, set_lazy_load_policy
+from app.models.sr_fct_header import SrFctHeader
+
+
+def first_header(db, *options):
+    return db.execute(select(SrFctHeader).options(*options).limit(1)).scalar_one()
+
+
+def test_raise(seeded_db, no_lazy_loads):
+    with database.SessionLocal() as db:
+        header = first_header(db)
+        with pytest.raises(LazyLoadError, match="Lazy load of SrFctHeader.items"):
+            header.items
+
+
+def test_eager_loads_are_allowed(seeded_db, no_lazy_loads):
+    with database.SessionLocal() as db:
+        header = first_header(db, selectinload(SrFctHeader.items))
+        assert header.items
+
+
+def test_warn(seeded_db, caplog):
+    previous = set_lazy_load_policy("warn")
+    try:
+        with database.SessionLocal() as db:
+            with caplog.at_level(logging.WARNING, logger="app.db.lazy_loads"):
+                assert first_header(db).items
+    finally:
+        set_lazy_load_policy(previous)
+    assert "Lazy load of SrFctHeader.items" in caplog.text
+
+
+def test_off(seeded_db, caplog):
+    previous = set_lazy_load_policy("off")
+    try:
+        with database.SessionLocal() as db:
+            with caplog.at_level(logging.WARNING, logger="app.db.lazy_loads"):
+                assert first_header(db).items
+    finally:
+        set_lazy_load_policy(previous)
+    assert "Lazy load" not in caplog.text
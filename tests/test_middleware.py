@@ -0,0 +1,56 @@
+# tests/test_middleware.py
+"""Metric labels use the matched route's template, never the raw path"""
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.middleware import route_template
+
+
+@pytest.fixture
+def templates():
+    """Client for a small app recording route_template for each request"""
+    seen = {}
+    router = APIRouter()
+
+    @router.get("/sr/{a}/items/{b}")
+    def item(a: str, b: str):
+        return {}
+
+    @router.get("/sr/{keyid}/sr")
+    def literal(keyid: str):
+        return {}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+
+    async def record(scope, receive, send):
+        await inner(scope, receive, send)
+        if scope["type"] == "http":
+            seen[scope["path"]] = route_template(scope)
+
+    inner = app.build_middleware_stack()
+    app.middleware_stack = record
+    return TestClient(app), seen
+
+
+@pytest.mark.parametrize(
+    "path, template",
+    [
+        # Repeated values and values equal to a literal segment stay as they are
+        ("/api/v1/sr/1/items/1", "/api/v1/sr/{a}/items/{b}"),
+        ("/api/v1/sr/sr/sr", "/api/v1/sr/{keyid}/sr"),
+        ("/api/v1/nothing/here", "unmatched"),
+    ],
+)
+def test_route_template(templates, path, template):
+    client, seen = templates
+    client.get(path)
+    assert seen[path] == template
+
+
+def test_app_route_labels(client, email):
+    client.get("/api/v1/sr/sync/", params={"email": email})
+    metrics = client.get("/metrics").text
+    assert 'route="/api/v1/sr/sync/"' in metrics
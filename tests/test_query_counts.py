@@ -0,0 +1,87 @@
+# tests/test_query_counts.py
+"""
+SQL statements per SR endpoint, an N+1 shows up as a failing test
+The tiny scale has several headers per email, each with items, attachments
+and a visit, so any per-row query goes over the ceiling
+"""
+
+import pytest
+
+from app.core.cache import sync_response_cache
+from app.services.dummy_data import fsp_email
+
+
+@pytest.fixture
+def cold_cache():
+    """Every sync GET reaches the database instead of the response cache"""
+    sync_response_cache.backend.clear()
+
+
+@pytest.mark.max_queries(5)
+def test_sync(client, email, cold_cache, no_lazy_loads):
+    # freshness probe, headers, then items, attachments and visits IN keyids
+    response = client.get("/api/v1/sr/sync/", params={"email": email})
+    assert response.status_code == 200
+    assert response.json()["data"]["header"]
+
+
+def test_sync_cached(client, email, assert_max_queries):
+    client.get("/api/v1/sr/sync/", params={"email": email})
+    # Only the freshness probe for a cache hit or a 304
+    with assert_max_queries(1):
+        response = client.get("/api/v1/sr/sync/", params={"email": email})
+    assert response.status_code == 200
+    with assert_max_queries(1):
+        response = client.get(
+            "/api/v1/sr/sync/",
+            params={"email": email},
+            headers={"If-None-Match": response.headers["ETag"]},
+        )
+    assert response.status_code == 304
+
+
+@pytest.mark.max_queries(6)
+def test_sync_delta(client, email):
+    # user row, delta headers, items, visits and delta attachments after the probe
+    response = client.get(
+        "/api/v1/sr/sync/",
+        params={"email": email, "updated_since": "2000-01-01T00:00:00"},
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["header"]
+
+
+@pytest.mark.max_queries(5)
+@pytest.mark.parametrize("format", ["ndjson", "json"])
+def test_sync_stream(client, email, format):
+    # user row, one header chunk with its items and visits, one attachment chunk
+    response = client.get(
+        "/api/v1/sr/sync/stream", params={"email": email, "format": format}
+    )
+    assert response.status_code == 200
+
+
+@pytest.mark.max_queries(4)
+def test_sync_batch(client):
+    # Same four queries however many emails are asked for
+    emails = [fsp_email(0), fsp_email(1)]
+    response = client.post("/api/v1/sr/sync/batch", json={"emails": emails})
+    assert response.status_code == 200
+    assert sorted(response.json()["data"]["results"]) == emails
+
+
+@pytest.mark.max_queries(4)
+def test_sync_reconcile(client, email):
+    response = client.post(
+        "/api/v1/sr/sync/reconcile", json={"email": email, "headers": {}}
+    )
+    assert response.status_code == 200
+    assert response.json()["data"]["header"]
+
+
+@pytest.mark.max_queries(2)
+@pytest.mark.parametrize("path", ["headers", "items", "attachments"])
+def test_table_pages(client, email, path, no_lazy_loads):
+    response = client.get(f"/api/v1/sr/{path}/", params={"email": email})
+    assert response.status_code == 200
+    assert response.json()["data"]
@@ -0,0 +1,49 @@
+# tests/test_sr_logsremarks.py
+"""Sync and async remark log CRUD return the same rows, each once"""
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.crud.sr_logsremarksheader import (
+    sr_logsremarksheader_crud,
+    async_sr_logsremarksheader_crud,
+)
+from app.crud.sr_logsremarksitems import (
+    sr_logsremarksitems_crud,
+    async_sr_logsremarksitems_crud,
+)
+from app.db import database
+
+
+def run_async(crud, email):
+    async def fetch():
+        engine = database.create_async_database_engine(
+            get_settings().async_database_url
+        )
+        try:
+            async with AsyncSession(engine) as db:
+                return await crud.get_by_email(db, email=email)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(fetch())
+
+
+@pytest.mark.parametrize(
+    "crud, async_crud",
+    [
+        (sr_logsremarksheader_crud, async_sr_logsremarksheader_crud),
+        (sr_logsremarksitems_crud, async_sr_logsremarksitems_crud),
+    ],
+)
+def test_sync_and_async_agree(seeded_db, email, crud, async_crud):
+    with database.SessionLocal() as db:
+        sync_ids = [log.id for log in crud.get_by_email(db, email=email)]
+    async_ids = [log.id for log in run_async(async_crud, email)]
+
+    assert sync_ids
+    assert len(sync_ids) == len(set(sync_ids))
+    assert sorted(async_ids) == sorted(sync_ids)
@@ -0,0 +1,80 @@
+# tests/test_sr_sync_freshness.py
+"""The sync ETag follows every table the payload is built from"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select, update
+
+from app.db import database
+from app.models.fct_visits import FctVisits
+from app.models.sr_fct_header import SrFctHeader
+
+SYNC_PATH = "/api/v1/sr/sync/"
+
+
+@pytest.fixture
+def visit(seeded_db, email):
+    """The visit behind one of the email's headers, restored after the test"""
+    with seeded_db.begin() as conn:
+        keyid = conn.execute(
+            select(SrFctHeader.keyid).where(SrFctHeader.fspemail == email).limit(1)
+        ).scalar_one()
+        original = conn.execute(
+            select(FctVisits.name, FctVisits.updatedate).where(
+                FctVisits.appkey == keyid
+            )
+        ).one()
+    yield keyid
+    with seeded_db.begin() as conn:
+        conn.execute(
+            update(FctVisits)
+            .where(FctVisits.appkey == keyid)
+            .values(name=original.name, updatedate=original.updatedate)
+        )
+
+
+def change_visit(appkey: str, name: str):
+    with database.engine.begin() as conn:
+        conn.execute(
+            update(FctVisits)
+            .where(FctVisits.appkey == appkey)
+            .values(name=name, updatedate=datetime.now().replace(microsecond=0))
+        )
+
+
+def customer_names(response) -> dict:
+    return {
+        header["keyid"]: header["customer_name"]
+        for header in response.json()["data"]["header"]
+    }
+
+
+def test_visit_change_moves_etag(client, email, visit):
+    first = client.get(SYNC_PATH, params={"email": email})
+    assert first.status_code == 200
+
+    change_visit(visit, "Renamed Customer")
+
+    response = client.get(
+        SYNC_PATH,
+        params={"email": email},
+        headers={"If-None-Match": first.headers["ETag"]},
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != first.headers["ETag"]
+    assert customer_names(response)[visit] == "Renamed Customer"
+
+
+def test_visit_change_skips_cached_payload(client, email, visit):
+    # The second GET would be answered from the response cache on an old tag
+    client.get(SYNC_PATH, params={"email": email})
+    cached = client.get(SYNC_PATH, params={"email": email})
+    assert customer_names(cached)[visit] != "Moved Customer"
+
+    change_visit(visit, "Moved Customer")
+
+    response = client.get(SYNC_PATH, params={"email": email})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != cached.headers["ETag"]
+    assert customer_names(response)[visit] == "Moved Customer"